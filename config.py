@@ -207,6 +207,37 @@ SQLALCHEMY_DATABASE_URI = (
 # Find out more here https://flask-sqlalchemy.palletsprojects.com/en/3.1.x/config/
 SQLALCHEMY_ENGINE_OPTIONS = {}
 
+# Reuse SQLAlchemy engines, and their connection pools, for analytics databases
+# across requests instead of creating an engine with a ``NullPool`` on every
+# ``Database.get_sqla_engine`` call. Engines are keyed on database, catalog, schema,
+# effective user, query source and the final connection parameters, and are disposed
+# when the database or its SSH tunnel is updated.
+DB_ENGINE_POOL_ENABLED = False
+# Pool parameters applied to pooled engines unless the database's own
+# ``engine_params`` set them, which allows tuning limits per database.
+DB_ENGINE_POOL_PARAMS: dict[str, Any] = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_recycle": 3600,
+    "pool_pre_ping": True,
+}
+# Pooled engines unused for this many seconds, with no checked out connections,
+# are disposed.
+DB_ENGINE_IDLE_TIMEOUT = int(timedelta(minutes=10).total_seconds())
+# Maximum number of pooled engines kept per process; the least recently used engine
+# is disposed when exceeded.
+DB_ENGINE_REGISTRY_MAX_SIZE = 100
+
+# Batch size used by ``Database.get_df(stream=True)`` and
+# ``Database.get_arrow_table`` when fetching results into Arrow.
+DB_STREAM_FETCH_BATCH_SIZE = 10000
+# Hard limit, in megabytes, on the Arrow memory of a streamed result. A query going
+# over it fails instead of taking the worker down. ``None`` disables the limit.
+DB_STREAM_MEMORY_LIMIT_MB: int | None = None
+# Number of leading non-null values inspected when detecting list/dict columns of a
+# query result that need to be serialized to JSON.
+POST_PROCESS_DF_SAMPLE_SIZE = 100
+
 # In order to hook up a custom password store for all SQLALCHEMY connections
 # implement a function that takes a single argument of type 'sqla.engine.url',
 # returns a password and set SQLALCHEMY_CUSTOM_PASSWORD_STORE.
@@ -740,6 +771,16 @@ THUMBNAIL_CACHE_CONFIG: CacheConfig = {
     "CACHE_NO_NULL_WARNING": True,
 }
 THUMBNAIL_ERROR_CACHE_TTL = int(timedelta(days=1).total_seconds())
+# Seconds a worker holds its claim on computing a thumbnail. A thumbnail still
+# computing after that is considered abandoned, e.g. by a worker that died, and is
+# computed again by the next worker asked for it.
+THUMBNAIL_COMPUTE_LEASE_TIMEOUT = int(timedelta(minutes=10).total_seconds())
+# Seconds a worker asked for a thumbnail another worker is computing waits for it to
+# finish, so that the thumbnail is cached when the request returns. Set to 0 to
+# return right away.
+THUMBNAIL_COMPUTE_WAIT_TIMEOUT = int(timedelta(minutes=1).total_seconds())
+# Seconds between cache reads of workers waiting for a thumbnail computed elsewhere
+THUMBNAIL_COMPUTE_POLL_INTERVAL = 1
 
 # Time before selenium times out after trying to locate an element on the page and wait
 # for that element to load for a screenshot.
@@ -753,6 +794,11 @@ SCREENSHOT_SELENIUM_RETRIES = 5
 SCREENSHOT_SELENIUM_HEADSTART = 3
 # Wait for the chart animation, in seconds
 SCREENSHOT_SELENIUM_ANIMATION_WAIT = 5
+# Wait for pages that implement the render ready protocol (see
+# `superset.utils.webdriver.RENDER_STATE_ATTRIBUTE`) to signal that their charts are
+# rendered, instead of the fixed headstart and animation waits above. Pages that do
+# not emit the signal within the headstart fall back to the fixed waits.
+SCREENSHOT_RENDER_READY_ENABLED = True
 # Replace unexpected errors in screenshots with real error messages
 SCREENSHOT_REPLACE_UNEXPECTED_ERRORS = False
 # Max time to wait for error message modal to show up, in seconds
@@ -767,6 +813,22 @@ SCREENSHOT_PLAYWRIGHT_WAIT_EVENT = "load"
 SCREENSHOT_PLAYWRIGHT_DEFAULT_TIMEOUT = int(
     timedelta(seconds=60).total_seconds() * 1000
 )
+# Number of threads resizing chart thumbnails captured from a dashboard, while the
+# next charts are captured
+SCREENSHOT_RESIZE_WORKERS = 4
+# Keep browsers running between screenshots instead of launching one per screenshot.
+# Each screenshot still gets its own browser context (Playwright) or has its cookies
+# and storage cleared afterwards (Selenium).
+SCREENSHOT_BROWSER_POOL_ENABLED = False
+# Maximum number of pooled browsers in use at the same time per worker process
+SCREENSHOT_BROWSER_POOL_SIZE = 2
+# Relaunch a pooled browser after this many screenshots
+SCREENSHOT_BROWSER_MAX_USES = 100
+# Relaunch pooled browsers when the browser processes of a worker use more memory
+# than this (requires psutil). Set to None to disable.
+SCREENSHOT_BROWSER_POOL_MAX_MEMORY_MB: int | None = 2048
+# Close pooled browsers that have been idle for this many seconds
+SCREENSHOT_BROWSER_IDLE_TIMEOUT = int(timedelta(minutes=10).total_seconds())
 
 # ---------------------------------------------------
 # Image and file configuration
@@ -816,6 +878,51 @@ EXPLORE_FORM_DATA_CACHE_CONFIG: CacheConfig = {
     "CODEC": JsonKeyValueCodec(),
 }
 
+# Row level security filters are cached in-process per role set and dataset for this
+# many seconds. Changes to RLS filters invalidate the cache of the worker making them
+# immediately, and of other workers through a version key in `CACHE_CONFIG`, so the
+# cache is not used with a `NullCache`. Set to 0 to query the metadata database on
+# every call.
+RLS_FILTER_CACHE_TTL = int(timedelta(minutes=5).total_seconds())
+# Maximum number of (role set, dataset) entries kept in the RLS filter cache
+RLS_FILTER_CACHE_MAX_SIZE = 10000
+
+# Per-user permission snapshots, used by `can_access` and `user_view_menu_names`,
+# are kept for this many seconds in-process and in `CACHE_CONFIG`. Role and
+# permission changes bump a version in `CACHE_CONFIG` that invalidates them in all
+# workers, so with a `NullCache` snapshots are only kept for the current request.
+# Set to 0 to disable.
+PERMISSION_SNAPSHOT_TTL = int(timedelta(minutes=5).total_seconds())
+# Maximum number of snapshots kept in-process
+PERMISSION_SNAPSHOT_MAX_SIZE = 10000
+
+# Functions decorated with `memoized_func(local=True)`, such as the schema and table
+# lists of a database, also keep their values in-process for this many seconds (but
+# never longer than the cache timeout of the call) in front of `CACHE_CONFIG`. Not
+# used with a `NullCache`. Set to 0 to always read from `CACHE_CONFIG`.
+MEMOIZED_FUNC_LOCAL_TTL = 60
+# Maximum number of values kept in-process per memoized function
+MEMOIZED_FUNC_LOCAL_MAX_SIZE = 1000
+
+# Results of series limit prequeries (the "top groups" of a chart with a series
+# limit) can be kept in `DATA_CACHE_CONFIG` for this many seconds under a key of
+# their own SQL (and of the effective user, for databases impersonating users), so
+# that reloading a chart skips them. Note that a cached prequery may not reflect
+# data changed since. Disabled (always run) by default, e.g. set to
+# `int(timedelta(minutes=5).total_seconds())` to enable.
+SERIES_LIMIT_PREQUERY_CACHE_TIMEOUT = 0
+# Engines whose series limit predicates use a row-value `IN`, i.e.
+# `(a, b) IN ((1, 2), (3, 4))`, instead of an `OR` of `AND`s when grouping by
+# several columns. Single column groups always use a plain `IN`.
+SERIES_LIMIT_TUPLE_IN_ENGINES: set[str] = {
+    "duckdb",
+    "mysql",
+    "postgresql",
+    "presto",
+    "sqlite",
+    "trino",
+}
+
 # store cache keys by datasource UID (via CacheKey) for custom processing/invalidation
 STORE_CACHE_KEYS_IN_METADATA_DB = False
 
@@ -865,6 +972,8 @@ ALLOWED_EXTENSIONS = {*EXCEL_EXTENSIONS, *CSV_EXTENSIONS, *COLUMNAR_EXTENSIONS}
 # method.
 # note: index option should not be overridden
 CSV_EXPORT = {"encoding": "utf-8"}
+# Number of rows escaped and rendered at a time when exporting CSV
+CSV_EXPORT_CHUNK_SIZE = 100000
 
 # Excel Options: key/value pairs that will be passed as argument to DataFrame.to_excel
 # method.
@@ -1318,6 +1427,18 @@ ALLOWED_EXTRA_AUTHENTICATIONS: dict[str, dict[str, Callable[..., Any]]] = {}
 # The id of a template dashboard that should be copied to every new user
 DASHBOARD_TEMPLATE_ID = None
 
+# The datasets payload of a dashboard (its datasources trimmed to what its charts
+# use) is kept in `CACHE_CONFIG` for this many seconds, under a key of the charts
+# and the `changed_on` of their datasources. Set to 0 to always compute it.
+DASHBOARD_DATASETS_CACHE_TIMEOUT = int(timedelta(hours=1).total_seconds())
+
+# Maximum number of series of a forecast (the `prophet` post processing operation)
+# fitted in parallel by a worker process. Set to 1 to fit them one after another.
+PROPHET_MAX_WORKERS = 4
+# Number of fitted forecast models kept per worker process, so that rendering a
+# forecast again, e.g. with more periods, does not refit its series
+PROPHET_MODEL_CACHE_MAX_SIZE = 32
+
 
 # A context manager that wraps the call to `create_engine`. This can be used for many
 # things, such as chrooting to prevent 3rd party drivers to access the filesystem, or
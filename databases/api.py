@@ -83,6 +83,7 @@ from superset.databases.schemas import (
     database_tables_query_schema,
     DatabaseConnectionSchema,
     DatabaseFunctionNamesResponse,
+    DatabasePoolStatsResponse,
     DatabasePostSchema,
     DatabasePutSchema,
     DatabaseRelatedObjectsResponse,
@@ -127,6 +128,7 @@ from superset.utils.core import (
     parse_js_uri_path_item,
 )
 from superset.utils.decorators import transaction
+from superset.utils.engine_registry import engine_registry
 from superset.utils.oauth2 import decode_oauth2_state
 from superset.utils.ssh_tunnel import mask_password_info
 from superset.views.base_api import (
@@ -161,6 +163,7 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
         "test_connection",
         "related_objects",
         "function_names",
+        "pool_stats",
         "available",
         "validate_parameters",
         "validate_sql",
@@ -286,6 +289,7 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
         CatalogsResponseSchema,
         DatabaseConnectionSchema,
         DatabaseFunctionNamesResponse,
+        DatabasePoolStatsResponse,
         DatabaseSchemaAccessForFileUploadResponse,
         DatabaseRelatedObjectsResponse,
         DatabaseTablesResponse,
@@ -1813,6 +1817,47 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
             function_names=database.function_names,
         )
 
+    @expose("/<int:pk>/pool_stats/", methods=("GET",))
+    @protect()
+    @safe
+    @statsd_metrics
+    @event_logger.log_this_with_context(
+        action=lambda self, *args, **kwargs: f"{self.__class__.__name__}"
+        f".pool_stats",
+        log_to_statsd=False,
+    )
+    def pool_stats(self, pk: int) -> Response:
+        """Get connection pool statistics of a database.
+        ---
+        get:
+          summary: Get connection pool statistics of a database
+          description: >-
+            Statistics of the engines pooled by this worker process for the database.
+            Only populated when `DB_ENGINE_POOL_ENABLED` is set.
+          parameters:
+          - in: path
+            name: pk
+            schema:
+              type: integer
+          responses:
+            200:
+              description: Pool statistics
+              content:
+                application/json:
+                  schema:
+                    $ref: "#/components/schemas/DatabasePoolStatsResponse"
+            401:
+              $ref: '#/components/responses/401'
+            404:
+              $ref: '#/components/responses/404'
+            500:
+              $ref: '#/components/responses/500'
+        """
+        database = DatabaseDAO.find_by_id(pk)
+        if not database:
+            return self.response_404()
+        return self.response(200, **engine_registry.get_stats(database.id))
+
     @expose("/available/", methods=("GET",))
     @protect()
     @statsd_metrics
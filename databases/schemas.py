@@ -794,6 +794,27 @@ class DatabaseFunctionNamesResponse(Schema):
     function_names = fields.List(fields.String())
 
 
+class DatabasePoolStatsEngine(Schema):
+    catalog = fields.String(allow_none=True)
+    schema = fields.String(allow_none=True)
+    effective_username = fields.String(allow_none=True)
+    source = fields.String(allow_none=True)
+    idle_seconds = fields.Float()
+    pool = fields.String(metadata={"description": "SQLAlchemy pool class"})
+    size = fields.Integer()
+    checkedin = fields.Integer()
+    checkedout = fields.Integer()
+    overflow = fields.Integer()
+
+
+class DatabasePoolStatsResponse(Schema):
+    hits = fields.Integer(metadata={"description": "Engine registry hits"})
+    misses = fields.Integer(metadata={"description": "Engine registry misses"})
+    evictions = fields.Integer(metadata={"description": "Disposed engines"})
+    tunnels = fields.Integer(metadata={"description": "Open SSH tunnels"})
+    engines = fields.List(fields.Nested(DatabasePoolStatsEngine))
+
+
 class ImportV1DatabaseExtraSchema(Schema):
     @pre_load
     def fix_schemas_allowed_for_csv_upload(  # pylint: disable=invalid-name
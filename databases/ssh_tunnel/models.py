@@ -31,6 +31,7 @@ from superset.models.helpers import (
     ExtraJSONMixin,
     ImportExportMixin,
 )
+from superset.utils.engine_registry import invalidate_ssh_tunnel_engines
 
 app_config = current_app.config
 
@@ -93,3 +94,7 @@ class SSHTunnel(AuditMixinNullable, ExtraJSONMixin, ImportExportMixin, Model):
         if self.private_key_password is not None:
             output["private_key_password"] = PASSWORD_MASK
         return output
+
+
+sa.event.listen(SSHTunnel, "after_update", invalidate_ssh_tunnel_engines)
+sa.event.listen(SSHTunnel, "after_delete", invalidate_ssh_tunnel_engines)
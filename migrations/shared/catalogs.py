@@ -18,7 +18,6 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 from typing import Any, Type, Union
 
 import sqlalchemy as sa
@@ -35,6 +34,7 @@ from superset.migrations.shared.security_converge import (
     PermissionView,
     ViewMenu,
 )
+from superset.migrations.shared.utils import run_in_batches
 from superset.models.core import Database
 
 logger = logging.getLogger("alembic")
@@ -128,37 +128,6 @@ def get_batch_size(session: Session) -> int:
     return max_sqlite_in if session.bind.dialect.name == "sqlite" else 1_000_000
 
 
-def print_processed_batch(
-    start_time: datetime,
-    offset: int,
-    total_rows: int,
-    model: ModelType,
-    batch_size: int,
-) -> None:
-    """
-    Print the progress of batch processing.
-
-    This function logs the progress of processing a batch of rows from a model.
-    It calculates the elapsed time since the start of the batch processing and
-    logs the number of rows processed along with the percentage completion.
-
-    Parameters:
-        start_time (datetime): The start time of the batch processing.
-        offset (int): The current offset in the batch processing.
-        total_rows (int): The total number of rows to process.
-        model (ModelType): The model being processed.
-        batch_size (int): The size of the batch being processed.
-    """
-    elapsed_time = datetime.now() - start_time
-    elapsed_seconds = elapsed_time.total_seconds()
-    elapsed_formatted = f"{int(elapsed_seconds // 3600):02}:{int((elapsed_seconds % 3600) // 60):02}:{int(elapsed_seconds % 60):02}"  # noqa: E501
-    rows_processed = min(offset + batch_size, total_rows)
-    logger.info(
-        f"{elapsed_formatted} - {rows_processed:,} of {total_rows:,} {model.__tablename__} rows processed "  # noqa: E501
-        f"({(rows_processed / total_rows) * 100:.2f}%)"
-    )
-
-
 def update_catalog_column(
     session: Session, database: Database, catalog: str, downgrade: bool = False
 ) -> None:
@@ -178,58 +147,26 @@ def update_catalog_column(
         downgrade (bool): If True, the `catalog` column is set to None where the
             catalog matches the specified catalog.
     """
-    start_time = datetime.now()
-
     logger.info(f"Updating {database.database_name} models to catalog {catalog}")
 
     for model, column in MODELS:
-        # Get the total number of rows that match the condition
-        total_rows = (
-            session.query(sa.func.count(model.id))
-            .filter(getattr(model, column) == database.id)
-            .filter(model.catalog == catalog if downgrade else True)
-            .scalar()
+        criteria = [getattr(model, column) == database.id]
+        if downgrade:
+            criteria.append(model.catalog == catalog)
+
+        run_in_batches(
+            session,
+            model,
+            criteria,
+            lambda condition: session.execute(
+                sa.update(model)
+                .where(condition)
+                .values(catalog=None if downgrade else catalog)
+                .execution_options(synchronize_session=False)
+            ),
+            batch_size=get_batch_size(session),
         )
 
-        logger.info(
-            f"Total rows to be processed for {model.__tablename__}: {total_rows:,}"
-        )
-
-        batch_size = get_batch_size(session)
-        limit_value = min(batch_size, total_rows)
-
-        # Update in batches using row numbers
-        for i in range(0, total_rows, batch_size):
-            subquery = (
-                session.query(model.id)
-                .filter(getattr(model, column) == database.id)
-                .filter(model.catalog == catalog if downgrade else True)
-                .order_by(model.id)
-                .offset(i)
-                .limit(limit_value)
-                .subquery()
-            )
-
-            # SQLite does not support multiple-table criteria within UPDATE
-            if session.bind.dialect.name == "sqlite":
-                ids_to_update = [row.id for row in session.query(subquery.c.id).all()]
-                if ids_to_update:
-                    session.execute(
-                        sa.update(model)
-                        .where(model.id.in_(ids_to_update))
-                        .values(catalog=None if downgrade else catalog)
-                        .execution_options(synchronize_session=False)
-                    )
-            else:
-                session.execute(
-                    sa.update(model)
-                    .where(model.id == subquery.c.id)
-                    .values(catalog=None if downgrade else catalog)
-                    .execution_options(synchronize_session=False)
-                )
-
-            print_processed_batch(start_time, i, total_rows, model, batch_size)
-
 
 def update_schema_catalog_perms(
     session: Session,
@@ -300,56 +237,21 @@ def delete_models_non_default_catalog(
         database (Database): The database instance containing the models to delete.
         catalog (Catalog): The catalog to use to filter the models to delete.
     """
-    start_time = datetime.now()
-
     logger.info(f"Deleting models not in the default catalog: {catalog}")
 
     for model, column in MODELS:
-        # Get the total number of rows that match the condition
-        total_rows = (
-            session.query(sa.func.count(model.id))
-            .filter(getattr(model, column) == database.id)
-            .filter(model.catalog != catalog)
-            .scalar()
+        run_in_batches(
+            session,
+            model,
+            [getattr(model, column) == database.id, model.catalog != catalog],
+            lambda condition: session.execute(
+                sa.delete(model)
+                .where(condition)
+                .execution_options(synchronize_session=False)
+            ),
+            batch_size=get_batch_size(session),
         )
 
-        logger.info(
-            f"Total rows to be processed for {model.__tablename__}: {total_rows:,}"
-        )
-
-        batch_size = get_batch_size(session)
-        limit_value = min(batch_size, total_rows)
-
-        # Update in batches using row numbers
-        for i in range(0, total_rows, batch_size):
-            subquery = (
-                session.query(model.id)
-                .filter(getattr(model, column) == database.id)
-                .filter(model.catalog != catalog)
-                .order_by(model.id)
-                .offset(i)
-                .limit(limit_value)
-                .subquery()
-            )
-
-            # SQLite does not support multiple-table criteria within DELETE
-            if session.bind.dialect.name == "sqlite":
-                ids_to_delete = [row.id for row in session.query(subquery.c.id).all()]
-                if ids_to_delete:
-                    session.execute(
-                        sa.delete(model)
-                        .where(model.id.in_(ids_to_delete))
-                        .execution_options(synchronize_session=False)
-                    )
-            else:
-                session.execute(
-                    sa.delete(model)
-                    .where(model.id == subquery.c.id)
-                    .execution_options(synchronize_session=False)
-                )
-
-            print_processed_batch(start_time, i, total_rows, model, batch_size)
-
 
 def upgrade_catalog_perms(engines: set[str] | None = None) -> None:
     """
@@ -23,7 +23,10 @@ from uuid import uuid4
 
 from alembic import op
 from sqlalchemy import (
+    and_,
+    bindparam,
     Column,
+    func,
     inspect,
     JSON,
     MetaData,
@@ -31,6 +34,7 @@ from sqlalchemy import (
     String,
     Table,
     text,
+    true,
     update,
 )
 from sqlalchemy.dialects.mysql.base import MySQLDialect
@@ -39,6 +43,7 @@ from sqlalchemy.dialects.sqlite.base import SQLiteDialect  # noqa: E402
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.exc import NoSuchTableError
 from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.schema import SchemaItem
 
 from superset.utils import json
@@ -53,6 +58,9 @@ logger = logging.getLogger("alembic")
 
 DEFAULT_BATCH_SIZE = int(os.environ.get("BATCH_SIZE", 1000))
 
+# JSON file keeping the last primary key of committed batches, see `run_in_batches`
+CHECKPOINT_FILE = os.environ.get("MIGRATION_CHECKPOINT_FILE")
+
 
 def get_table_column(
     table_name: str,
@@ -153,26 +161,25 @@ def paginated_update(
 ) -> Iterator[Any]:
     """
     Update models in small batches so we don't have to load everything in memory.
+
+    Models are read a page at a time, ordered by primary key and starting after the
+    last key of the previous page, and each page is committed. Unlike one result
+    kept open across commits, every page is a short indexed read, and rows updated
+    out of the filter of the query are not skipped.
     """
 
     total = query.count()
     processed = 0
     session: Session = inspect(query).session
-    result = session.execute(query)
 
     if print_page_progress is None or print_page_progress is True:
         print_page_progress = lambda processed, total: print(  # noqa: E731
             f"    {processed}/{total}", end="\r"
         )
 
-    while True:
-        rows = result.fetchmany(batch_size)
-
-        if not rows:
-            break
-
+    for rows in _iter_pages(query, session, batch_size):
         for row in rows:
-            yield row[0]
+            yield row
 
         session.commit()
         processed += len(rows)
@@ -181,6 +188,190 @@ def paginated_update(
             print_page_progress(processed, total)
 
 
+def _iter_pages(
+    query: Query,
+    session: Session,
+    batch_size: int,
+) -> Iterator[list[Any]]:
+    entity = query.column_descriptions[0]["entity"]
+    mapper = inspect(entity, raiseerr=False) if isinstance(entity, type) else None
+    if (
+        mapper is None
+        or len(query.column_descriptions) != 1
+        or len(mapper.primary_key) != 1
+    ):
+        # no single primary key to seek on, fetch from one result
+        result = session.execute(query)
+        while rows := result.fetchmany(batch_size):
+            yield [row[0] for row in rows]
+        return
+
+    pk = getattr(entity, mapper.get_property_by_column(mapper.primary_key[0]).key)
+    query = query.order_by(None).order_by(pk)
+    last = None
+    while True:
+        page = query.filter(pk > last) if last is not None else query
+        if not (rows := page.limit(batch_size).all()):
+            return
+        last = getattr(rows[-1], pk.key)
+        yield rows
+
+
+def load_checkpoint(name: str) -> Any:
+    """
+    Return the last primary key saved for a batch job, if any.
+
+    :param name: The name of the batch job
+    """
+    if not CHECKPOINT_FILE or not os.path.exists(CHECKPOINT_FILE):
+        return None
+    with open(CHECKPOINT_FILE) as file:
+        return json.loads(file.read()).get(name)
+
+
+def save_checkpoint(name: str, value: Any) -> None:
+    """
+    Save the last primary key of a batch job, or clear it if ``value`` is ``None``.
+
+    :param name: The name of the batch job
+    :param value: The last primary key processed
+    """
+    if not CHECKPOINT_FILE:
+        return
+    checkpoints = {}
+    if os.path.exists(CHECKPOINT_FILE):
+        with open(CHECKPOINT_FILE) as file:
+            checkpoints = json.loads(file.read())
+    if value is None:
+        checkpoints.pop(name, None)
+    else:
+        checkpoints[name] = value
+    with open(CHECKPOINT_FILE, "w") as file:
+        file.write(json.dumps(checkpoints))
+
+
+def keyset_batches(
+    session: Session,
+    pk: Any,
+    criteria: list[Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    start_after: Any = None,
+) -> Iterator[tuple[Any, Any]]:
+    """
+    Split the rows matching ``criteria`` into ranges of ``batch_size`` rows.
+
+    Only the last primary key of each range is read, by seeking on the primary key
+    from the end of the previous range, so each range costs the same wherever it is
+    in the table, unlike ``OFFSET``.
+
+    :param session: The session to read the ranges with
+    :param pk: The primary key column
+    :param criteria: The conditions on the rows
+    :param batch_size: The number of rows in a range
+    :param start_after: Only split rows with a primary key greater than this
+    :returns: The ``(after, upto)`` primary keys of each range, ``upto`` is ``None``
+        for the last range
+    """
+    after = start_after
+    while True:
+        query = select(pk).where(*criteria, keyset_range(pk, after, None))
+        upto = session.execute(
+            query.order_by(pk).offset(batch_size - 1).limit(1)
+        ).scalar()
+        yield after, upto
+        if upto is None:
+            return
+        after = upto
+
+
+def keyset_range(pk: Any, after: Any, upto: Any) -> ColumnElement[bool]:
+    """
+    The condition selecting the primary keys in ``(after, upto]``, either bound being
+    optional.
+    """
+    conditions = []
+    if after is not None:
+        conditions.append(pk > after)
+    if upto is not None:
+        conditions.append(pk <= upto)
+    return and_(*conditions) if conditions else true()
+
+
+def run_in_batches(  # pylint: disable=too-many-arguments
+    session: Session,
+    model: Any,
+    criteria: list[Any],
+    execute: Callable[[ColumnElement[bool]], Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    commit: bool = False,
+    checkpoint: str | None = None,
+) -> None:
+    """
+    Run a statement over the rows of a model in batches of consecutive primary keys.
+
+    The ranges of primary keys come from `keyset_batches`, so the statement can be an
+    ``UPDATE`` or ``DELETE`` changing whether rows match ``criteria`` without rows
+    being skipped, and no list of ids has to be sent back to the database.
+
+    With ``commit`` every batch is committed, and with a ``checkpoint`` name and
+    ``MIGRATION_CHECKPOINT_FILE`` set, the end of every batch is saved so that an
+    interrupted run resumes after the last committed batch.
+
+    :param session: The session to run the statements with
+    :param model: The model of the table
+    :param criteria: The conditions on the rows to process
+    :param execute: Runs the statement for the rows matching a condition, returning
+        its result
+    :param batch_size: The number of rows in a batch
+    :param commit: Whether to commit every batch
+    :param checkpoint: The name to save the progress of the job under
+    """
+    (pk,) = inspect(model).primary_key
+    start_after = load_checkpoint(checkpoint) if commit and checkpoint else None
+    if start_after is not None:
+        logger.info(f"Resuming {model.__tablename__} after {pk.name}={start_after}")
+
+    total = session.execute(
+        select(func.count())
+        .select_from(model)
+        .where(*criteria, keyset_range(pk, start_after, None))
+    ).scalar()
+    logger.info(f"Total rows to be processed for {model.__tablename__}: {total:,}")
+    if not total:
+        return
+
+    start_time = time.time()
+    processed = 0
+    for after, upto in keyset_batches(session, pk, criteria, batch_size, start_after):
+        result = execute(and_(*criteria, keyset_range(pk, after, upto)))
+        rowcount = getattr(result, "rowcount", -1)
+        processed += rowcount if rowcount >= 0 else batch_size
+        if commit:
+            session.commit()
+            if checkpoint:
+                save_checkpoint(checkpoint, upto)
+        print_batch_progress(start_time, processed, total, model.__tablename__)
+
+
+def print_batch_progress(
+    start_time: float,
+    processed: int,
+    total: int,
+    name: str,
+) -> None:
+    """
+    Log the number of rows processed by a batch job, and its throughput.
+    """
+    elapsed = time.time() - start_time
+    processed = min(processed, total)
+    rate = processed / elapsed if elapsed else 0
+    logger.info(
+        f"{int(elapsed // 3600):02}:{int(elapsed % 3600 // 60):02}:"
+        f"{int(elapsed % 60):02} - {processed:,} of {total:,} {name} rows processed "
+        f"({processed / total * 100:.2f}%, {rate:,.0f} rows/s)"
+    )
+
+
 def try_load_json(data: Optional[str]) -> dict[str, Any]:
     return data and json.loads(data) or {}
 
@@ -480,12 +671,102 @@ def create_fks_for_table(
         )
 
 
-def cast_text_column_to_json(
+def _iter_column_batches(
+    conn: Any,
+    t: Table,
+    column: str,
+    pk: str,
+    batch_size: int,
+) -> Iterator[list[Any]]:
+    """
+    Read the non null values of a column in batches ordered by primary key.
+    """
+    last = None
+    while True:
+        query = select(t.c[pk], t.c[column]).where(t.c[column].is_not(None))
+        if last is not None:
+            query = query.where(t.c[pk] > last)
+        rows = conn.execute(query.order_by(t.c[pk]).limit(batch_size)).fetchall()
+        if not rows:
+            return
+        last = rows[-1][0]
+        yield rows
+
+
+def _is_valid_json(column: str, pk: str, row_pk: Any, value: Any) -> bool:
+    try:
+        json.loads(value)
+    except json.JSONDecodeError:
+        logger.warning(
+            f"Invalid JSON value in column {column} for {pk}={row_pk}: {value}"
+        )
+        return False
+    return True
+
+
+def _select_json_invalid_in_mysql(
+    conn: Any,
+    t: Table,
+    column: str,
+    pk: str,
+) -> list[Any]:
+    """
+    Read the non null values of a column that MySQL's ``JSON_VALID`` rejects.
+
+    ``JSON_VALID`` is stricter than ``superset.utils.json.loads``, which also
+    accepts ``NaN`` and ``Infinity``, so these values still need checking in Python.
+    """
+    return conn.execute(
+        select(t.c[pk], t.c[column]).where(
+            t.c[column].is_not(None),
+            func.json_valid(t.c[column]) == 0,
+        )
+    ).fetchall()
+
+
+def count_invalid_json(
+    table: str,
+    column: str,
+    pk: str = "id",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Count, and log, the values of a text column that are not valid JSON.
+
+    MySQL validates them with ``JSON_VALID`` in the database, and only the values it
+    rejects in Python, other databases read the column in batches and validate it
+    in Python.
+
+    :param table: The name of the table.
+    :param column: The name of the column to be checked.
+    :param pk: The name of the primary key column.
+    :param batch_size: The number of rows validated at a time.
+    :returns: The number of invalid values.
+    """
+    conn = op.get_bind()
+    t = Table(table, MetaData(), autoload_with=conn)
+
+    if isinstance(conn.dialect, MySQLDialect):
+        return sum(
+            not _is_valid_json(column, pk, row_pk, value)
+            for row_pk, value in _select_json_invalid_in_mysql(conn, t, column, pk)
+        )
+
+    return sum(
+        not _is_valid_json(column, pk, row_pk, value)
+        for rows in _iter_column_batches(conn, t, column, pk, batch_size)
+        for row_pk, value in rows
+    )
+
+
+def cast_text_column_to_json(  # pylint: disable=too-many-arguments
     table: str,
     column: str,
     pk: str = "id",
     nullable: bool = True,
     suffix: str = "_tmp",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
 ) -> None:
     """
     Cast a text column to JSON.
@@ -494,14 +775,30 @@ def cast_text_column_to_json(
     database doesn't support the type natively. We should always use it when storing
     JSON payloads.
 
+    Values that are not valid JSON are set to null. Postgres casts the column in
+    place, MySQL copies the values ``JSON_VALID`` accepts with a single statement
+    and checks the ones it rejects in Python (see
+    ``_select_json_invalid_in_mysql``), and other databases validate the values in
+    batches and write them with one ``executemany`` per batch.
+
     :param table: The name of the table.
     :param column: The name of the column to be cast.
     :param pk: The name of the primary key column.
     :param nullable: Whether the new column should be nullable.
     :param suffix: The suffix to be added to the temporary column name.
+    :param batch_size: The number of rows validated and written at a time.
+    :param dry_run: Only count the values that are not valid JSON.
     """
     conn = op.get_bind()
 
+    if dry_run:
+        invalid = count_invalid_json(table, column, pk, batch_size)
+        logger.info(
+            f"{invalid:,} values of {table}.{column} are not valid JSON and would be "
+            "set to null"
+        )
+        return
+
     if isinstance(conn.dialect, PGDialect):
         conn.execute(
             text(
@@ -534,18 +831,40 @@ USING safe_to_jsonb({column});
 
     meta = MetaData()
     t = Table(table, meta, autoload_with=conn)
-    stmt_select = select(t.c[pk], t.c[column]).where(t.c[column].is_not(None))
 
-    for row_pk, value in conn.execute(stmt_select):
-        try:
-            json.loads(value)
-        except json.JSONDecodeError:
-            logger.warning(
-                f"Invalid JSON value in column {column} for {pk}={row_pk}: {value}"
-            )
-            continue
-        stmt_update = update(t).where(t.c[pk] == row_pk).values({tmp_column: value})
-        conn.execute(stmt_update)
+    stmt_update = (
+        update(t)
+        .where(t.c[pk] == bindparam("_pk"))
+        .values({tmp_column: bindparam("_value")})
+    )
+    if isinstance(conn.dialect, MySQLDialect):
+        conn.execute(
+            update(t)
+            .where(t.c[column].is_not(None), func.json_valid(t.c[column]) == 1)
+            # like binding the text to the JSON column, which stores a JSON string
+            .values({tmp_column: func.json_quote(t.c[column])})
+        )
+        if params := [
+            {"_pk": row_pk, "_value": value}
+            for row_pk, value in _select_json_invalid_in_mysql(conn, t, column, pk)
+            if _is_valid_json(column, pk, row_pk, value)
+        ]:
+            conn.execute(stmt_update, params)
+    else:
+        total = conn.execute(
+            select(func.count()).select_from(t).where(t.c[column].is_not(None))
+        ).scalar()
+        start_time = time.time()
+        processed = 0
+        for rows in _iter_column_batches(conn, t, column, pk, batch_size):
+            if params := [
+                {"_pk": row_pk, "_value": value}
+                for row_pk, value in rows
+                if _is_valid_json(column, pk, row_pk, value)
+            ]:
+                conn.execute(stmt_update, params)
+            processed += len(rows)
+            print_batch_progress(start_time, processed, total, table)
 
     op.drop_column(table, column)
     op.alter_column(table, tmp_column, existing_type=JSON(), new_column_name=column)
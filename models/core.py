@@ -30,14 +30,16 @@ from copy import deepcopy
 from datetime import datetime
 from functools import lru_cache
 from inspect import signature
-from typing import Any, Callable, cast, TYPE_CHECKING
+from typing import Any, Callable, cast, Iterator, TYPE_CHECKING, TypeVar
 
 import numpy
 import pandas as pd
+import pyarrow as pa
 import sqlalchemy as sqla
 import sshtunnel
 from flask import g
 from flask_appbuilder import Model
+from flask_babel import gettext as _
 from marshmallow.exceptions import ValidationError
 from sqlalchemy import (
     Boolean,
@@ -65,7 +67,9 @@ from superset import app, db, db_engine_specs, is_feature_enabled
 from superset.commands.database.exceptions import DatabaseInvalidError
 from superset.constants import LRU_CACHE_MAX_SIZE, PASSWORD_MASK
 from superset.databases.utils import make_url_safe
-from superset.db_engine_specs.base import MetricType, TimeGrain
+from superset.db_engine_specs.base import BaseEngineSpec, MetricType, TimeGrain
+from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
+from superset.exceptions import SupersetErrorException
 from superset.extensions import (
     cache_manager,
     encrypted_field_factory,
@@ -74,7 +78,7 @@ from superset.extensions import (
     ssh_manager_factory,
 )
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin, UUIDMixin
-from superset.result_set import SupersetResultSet
+from superset.result_set import dedup, stringify_values, SupersetResultSet
 from superset.sql.parse import SQLScript, Table
 from superset.superset_typing import (
     DbapiDescription,
@@ -84,6 +88,7 @@ from superset.superset_typing import (
 from superset.utils import cache as cache_util, core as utils, json
 from superset.utils.backports import StrEnum
 from superset.utils.core import get_query_source_from_request, get_username
+from superset.utils.engine_registry import engine_registry, invalidate_database_engines
 from superset.utils.oauth2 import (
     check_for_oauth2,
     get_oauth2_access_token,
@@ -103,6 +108,56 @@ if TYPE_CHECKING:
 
 DB_CONNECTION_MUTATOR = config["DB_CONNECTION_MUTATOR"]
 
+T = TypeVar("T")
+
+
+def _stringify_to_arrow(values: tuple[Any, ...]) -> pa.Array:
+    # build the object array element-wise, numpy would turn nested lists into 2D
+    array = numpy.empty(len(values), dtype=object)
+    for idx, value in enumerate(values):
+        array[idx] = value
+    return pa.array(stringify_values(array).tolist())
+
+
+def _values_to_arrow(values: tuple[Any, ...], keep_nested: bool = False) -> pa.Array:
+    """
+    Convert one batch of a column to Arrow, stringifying like ``SupersetResultSet``.
+
+    With ``keep_nested`` list and struct values stay native Arrow types.
+    """
+    try:
+        array = pa.array(values)
+    except (pa.lib.ArrowInvalid, pa.lib.ArrowTypeError, TypeError):
+        return _stringify_to_arrow(values)
+
+    if pa.types.is_nested(array.type) and not keep_nested:
+        return _stringify_to_arrow(values)
+    return array
+
+
+def _append_chunk(chunks: list[pa.Array], array: pa.Array) -> list[pa.Array]:
+    """
+    Append a chunk to a column, reconciling its type with the previous chunks.
+
+    Types are inferred per batch, so a column that was all NULL in the first batch,
+    or ints in one batch and floats in the next, needs its chunks unified. When no
+    common type exists the whole column falls back to strings.
+    """
+    if not chunks or chunks[0].type == array.type:
+        chunks.append(array)
+        return chunks
+
+    current = chunks[0].type
+    for target in (current, array.type, pa.string()):
+        try:
+            return [
+                chunk.cast(target) if chunk.type != target else chunk
+                for chunk in (*chunks, array)
+            ]
+        except (pa.lib.ArrowInvalid, pa.lib.ArrowNotImplementedError):
+            continue
+    raise pa.lib.ArrowInvalid(f"Cannot unify column types {current} and {array.type}")
+
 
 class KeyValue(Model):  # pylint: disable=too-few-public-methods
     """Used for any type of key-value store"""
@@ -410,7 +465,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         self,
         catalog: str | None = None,
         schema: str | None = None,
-        nullpool: bool = True,
+        nullpool: bool | None = None,
         source: utils.QuerySource | None = None,
         override_ssh_tunnel: SSHTunnel | None = None,
     ) -> Engine:
@@ -421,22 +476,32 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         context manager (as opposed to the engine directly) is important because we need
         to potentially establish SSH tunnels before the connection is created, and clean
         them up once the engine is no longer used.
+
+        When ``nullpool`` is not given it defaults to the inverse of
+        ``DB_ENGINE_POOL_ENABLED``. Pooled engines (and their SSH tunnels) are kept in
+        the process-wide ``engine_registry`` instead of being torn down on exit.
         """
         from superset.daos.database import (  # pylint: disable=import-outside-toplevel
             DatabaseDAO,
         )
 
+        if nullpool is None:
+            nullpool = not config["DB_ENGINE_POOL_ENABLED"]
+
         sqlalchemy_uri = self.sqlalchemy_uri_decrypted
 
         ssh_tunnel = override_ssh_tunnel or DatabaseDAO.get_ssh_tunnel(self.id)
-        ssh_context_manager = (
-            ssh_manager_factory.instance.create_tunnel(
+        if not ssh_tunnel:
+            ssh_context_manager = nullcontext()
+        elif nullpool:
+            ssh_context_manager = ssh_manager_factory.instance.create_tunnel(
                 ssh_tunnel=ssh_tunnel,
                 sqlalchemy_database_uri=sqlalchemy_uri,
             )
-            if ssh_tunnel
-            else nullcontext()
-        )
+        else:
+            ssh_context_manager = nullcontext(
+                engine_registry.get_tunnel(self.id, ssh_tunnel, sqlalchemy_uri)
+            )
 
         with ssh_context_manager as ssh_context:
             if ssh_context:
@@ -467,10 +532,13 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         self,
         catalog: str | None = None,
         schema: str | None = None,
-        nullpool: bool = True,
+        nullpool: bool | None = None,
         source: utils.QuerySource | None = None,
         sqlalchemy_uri: str | None = None,
     ) -> Engine:
+        if nullpool is None:
+            nullpool = not config["DB_ENGINE_POOL_ENABLED"]
+
         sqlalchemy_url = make_url_safe(
             sqlalchemy_uri if sqlalchemy_uri else self.sqlalchemy_uri_decrypted
         )
@@ -532,7 +600,19 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                 source,
             )
         try:
-            return create_engine(sqlalchemy_url, **engine_kwargs)
+            if nullpool:
+                return create_engine(sqlalchemy_url, **engine_kwargs)
+
+            key = engine_registry.build_key(
+                self.id,
+                catalog,
+                schema,
+                effective_username,
+                source,
+                sqlalchemy_url,
+                engine_kwargs,
+            )
+            return engine_registry.get_engine(key, sqlalchemy_url, engine_kwargs)
         except Exception as ex:
             raise self.db_engine_spec.get_dbapi_mapped_exception(ex) from ex
 
@@ -559,7 +639,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         self,
         catalog: str | None = None,
         schema: str | None = None,
-        nullpool: bool = True,
+        nullpool: bool | None = None,
         source: utils.QuerySource | None = None,
     ) -> Connection:
         with self.get_sqla_engine(
@@ -610,17 +690,37 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         return self.db_engine_spec.get_default_schema_for_query(self, query)
 
     @staticmethod
-    def post_process_df(df: pd.DataFrame) -> pd.DataFrame:
+    def post_process_df(
+        df: pd.DataFrame,
+        keep_nested: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Serialize nested (list/dict) columns of a result to JSON strings.
+
+        Columns are detected from a sample of their first non-null values rather than
+        only the first row, and each detected column is encoded in one batch.
+
+        :param keep_nested: leave nested values untouched, for consumers that handle
+            them natively
+        """
+        if keep_nested:
+            return df
+
+        sample_size = config["POST_PROCESS_DF_SAMPLE_SIZE"]
+
         def column_needs_conversion(df_series: pd.Series) -> bool:
-            return (
-                not df_series.empty
-                and isinstance(df_series, pd.Series)
-                and isinstance(df_series[0], (list, dict))
-            )
+            if df_series.empty or not isinstance(df_series, pd.Series):
+                return False
+            sample = df_series.iloc[:sample_size].dropna()
+            return any(isinstance(value, (list, dict)) for value in sample)
 
         for col, coltype in df.dtypes.to_dict().items():
             if coltype == numpy.object_ and column_needs_conversion(df[col]):
-                df[col] = df[col].apply(json.json_dumps_w_dates)
+                df[col] = pd.Series(
+                    json.json_dumps_w_dates_many(df[col].to_numpy()),
+                    index=df.index,
+                    dtype=object,
+                )
         return df
 
     @property
@@ -651,13 +751,113 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
             )
         return sql_
 
-    def get_df(
+    def get_df(  # pylint: disable=too-many-arguments
         self,
         sql: str,
         catalog: str | None = None,
         schema: str | None = None,
         mutator: Callable[[pd.DataFrame], None] | None = None,
+        stream: bool = False,
+        keep_nested: bool = False,
     ) -> pd.DataFrame:
+        """
+        Run a SQL script and return the result of its last statement as a DataFrame.
+
+        :param stream: fetch the result in batches straight into Arrow (see
+            ``fetch_arrow_table``) instead of materializing it as a list of tuples
+            first. Ignored for engine specs with a custom ``fetch_data``.
+        :param keep_nested: do not serialize list/dict columns to JSON strings. When
+            streaming, these come back as Arrow list/struct columns converted to
+            pandas (arrays and dicts).
+        """
+        if stream and self.supports_streaming_fetch:
+            table = self.get_arrow_table(
+                sql,
+                catalog=catalog,
+                schema=schema,
+                keep_nested=keep_nested,
+            )
+            df = (
+                SupersetResultSet.convert_table_to_df(table)
+                if table is not None
+                else None
+            )
+        else:
+            df = self._execute_script(
+                sql,
+                catalog,
+                schema,
+                lambda cursor: self.load_into_dataframe(
+                    cursor.description,
+                    self.fetch_rows(cursor, True),
+                ),
+            )
+
+        if mutator:
+            df = mutator(df)
+
+        return self.post_process_df(df, keep_nested=keep_nested)
+
+    def get_arrow_table(
+        self,
+        sql: str,
+        catalog: str | None = None,
+        schema: str | None = None,
+        keep_nested: bool = False,
+    ) -> pa.Table | None:
+        """
+        Run a SQL script and return the result of its last statement as an Arrow table.
+
+        The result is fetched in ``DB_STREAM_FETCH_BATCH_SIZE`` batches and never
+        held as Python tuples, see ``fetch_arrow_table``.
+        """
+        return self._execute_script(
+            sql,
+            catalog,
+            schema,
+            lambda cursor: self.fetch_arrow_table(cursor, keep_nested=keep_nested),
+        )
+
+    def iter_arrow_batches(
+        self,
+        sql: str,
+        catalog: str | None = None,
+        schema: str | None = None,
+        keep_nested: bool = False,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Run a SQL script and yield the result of its last statement as Arrow record
+        batches of ``DB_STREAM_FETCH_BATCH_SIZE`` rows.
+
+        The connection stays open until the generator is exhausted or closed, and no
+        more than one batch is held in memory, which lets exports stream results of
+        any size. Column types are inferred per batch.
+        """
+        with self._script_cursor(sql, catalog, schema) as cursor:
+            if cursor is not None:
+                yield from self._fetch_arrow_batches(cursor, keep_nested)
+
+    def _execute_script(
+        self,
+        sql: str,
+        catalog: str | None,
+        schema: str | None,
+        fetch: Callable[[Any], T],
+    ) -> T | None:
+        with self._script_cursor(sql, catalog, schema) as cursor:
+            return fetch(cursor) if cursor is not None else None
+
+    @contextmanager
+    def _script_cursor(
+        self,
+        sql: str,
+        catalog: str | None,
+        schema: str | None,
+    ) -> Any:
+        """
+        Run all statements of a script, yielding the cursor of the last one for the
+        caller to fetch (or ``None`` for an empty script).
+        """
         script = SQLScript(sql, self.db_engine_spec.engine)
         with self.get_sqla_engine(catalog=catalog, schema=schema) as engine:
             engine_url = engine.url
@@ -674,7 +874,6 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 
         with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
             cursor = conn.cursor()
-            df = None
             for i, statement in enumerate(script.statements):
                 sql_ = self.mutate_sql_based_on_config(
                     statement.format(),
@@ -688,14 +887,10 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                 ):
                     self.db_engine_spec.execute(cursor, sql_, self)
 
-                rows = self.fetch_rows(cursor, i == len(script.statements) - 1)
-                if rows is not None:
-                    df = self.load_into_dataframe(cursor.description, rows)
-
-            if mutator:
-                df = mutator(df)
+                if i < len(script.statements) - 1:
+                    self.fetch_rows(cursor, False)
 
-            return self.post_process_df(df)
+            yield cursor if script.statements else None
 
     @event_logger.log_this
     def fetch_rows(self, cursor: Any, last: bool) -> list[tuple[Any, ...]] | None:
@@ -705,6 +900,102 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 
         return self.db_engine_spec.fetch_data(cursor)
 
+    @property
+    def supports_streaming_fetch(self) -> bool:
+        # engine specs overriding ``fetch_data`` may post-process rows in ways the
+        # batched Arrow path does not reproduce, so they keep the buffered path
+        fetch_data = self.db_engine_spec.fetch_data.__func__  # type: ignore
+        return fetch_data is BaseEngineSpec.fetch_data.__func__  # type: ignore
+
+    @event_logger.log_this
+    def fetch_arrow_table(self, cursor: Any, keep_nested: bool = False) -> pa.Table:
+        """
+        Fetch a cursor in ``fetchmany`` batches straight into Arrow column chunks.
+
+        Each batch is converted column by column and released, so the only full copy
+        of the result is the Arrow table itself. Column types follow the same rules as
+        ``SupersetResultSet``: columns that cannot be converted and, unless
+        ``keep_nested`` is set, nested columns are stringified. Raises once the table
+        grows beyond ``DB_STREAM_MEMORY_LIMIT_MB``.
+        """
+        names = dedup([col[0] for col in cursor.description or []])
+        memory_limit_mb = config["DB_STREAM_MEMORY_LIMIT_MB"]
+
+        columns: list[list[pa.Array]] = [[] for _ in names]
+        nbytes = 0
+        for batch in self._fetch_arrow_batches(cursor, keep_nested):
+            for idx, array in enumerate(batch.columns):
+                columns[idx] = _append_chunk(columns[idx], array)
+            nbytes += batch.nbytes
+            if memory_limit_mb and nbytes > memory_limit_mb * 1024 * 1024:
+                raise SupersetErrorException(
+                    SupersetError(
+                        error_type=SupersetErrorType.GENERIC_DB_ENGINE_ERROR,
+                        message=_(
+                            "The query result exceeds the %(limit)s MB memory "
+                            "limit. Please add a row limit or select fewer "
+                            "columns.",
+                            limit=memory_limit_mb,
+                        ),
+                        level=ErrorLevel.ERROR,
+                    )
+                )
+
+        return pa.Table.from_arrays(
+            [
+                pa.chunked_array(chunks, type=chunks[0].type if chunks else pa.null())
+                for chunks in columns
+            ],
+            names=names,
+        )
+
+    def _fetch_arrow_batches(
+        self,
+        cursor: Any,
+        keep_nested: bool = False,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Fetch a cursor in ``fetchmany`` batches, converting each one to an Arrow
+        record batch column by column.
+        """
+        db_engine_spec = self.db_engine_spec
+        if db_engine_spec.arraysize:
+            cursor.arraysize = db_engine_spec.arraysize
+
+        description = cursor.description or []
+        names = dedup([col[0] for col in description])
+        mutators = {
+            idx: func
+            for idx, row in enumerate(description)
+            if (
+                func := db_engine_spec.column_type_mutators.get(
+                    type(
+                        db_engine_spec.get_sqla_column_type(
+                            db_engine_spec.get_datatype(row[1])
+                        )
+                    )
+                )
+            )
+        }
+        batch_size = config["DB_STREAM_FETCH_BATCH_SIZE"]
+
+        while True:
+            try:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                arrays = []
+                for idx, values in enumerate(zip(*rows, strict=True)):
+                    if func := mutators.get(idx):
+                        values = tuple(func(value) for value in values)
+                    arrays.append(_values_to_arrow(values, keep_nested))
+                del rows
+            except SupersetErrorException:
+                raise
+            except Exception as ex:
+                raise db_engine_spec.get_dbapi_mapped_exception(ex) from ex
+            yield pa.RecordBatch.from_arrays(arrays, names=names)
+
     @event_logger.log_this
     def load_into_dataframe(
         self,
@@ -783,6 +1074,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
     @cache_util.memoized_func(
         key="db:{self.id}:catalog:{catalog}:schema:{schema}:table_list",
         cache=cache_manager.cache,
+        local=True,
     )
     def get_all_table_names_in_schema(
         self,
@@ -817,6 +1109,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
     @cache_util.memoized_func(
         key="db:{self.id}:catalog:{catalog}:schema:{schema}:view_list",
         cache=cache_manager.cache,
+        local=True,
     )
     def get_all_view_names_in_schema(
         self,
@@ -865,6 +1158,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
     @cache_util.memoized_func(
         key="db:{self.id}:catalog:{catalog}:schema_list",
         cache=cache_manager.cache,
+        local=True,
     )
     def get_all_schema_names(
         self,
@@ -894,6 +1188,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
     @cache_util.memoized_func(
         key="db:{self.id}:catalog_list",
         cache=cache_manager.cache,
+        local=True,
     )
     def get_all_catalog_names(
         self,
@@ -1174,6 +1469,8 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 sqla.event.listen(Database, "after_insert", security_manager.database_after_insert)
 sqla.event.listen(Database, "after_update", security_manager.database_after_update)
 sqla.event.listen(Database, "after_delete", security_manager.database_after_delete)
+sqla.event.listen(Database, "after_update", invalidate_database_engines)
+sqla.event.listen(Database, "after_delete", invalidate_database_engines)
 
 
 class DatabaseUserOAuth2Tokens(Model, AuditMixinNullable):
@@ -16,6 +16,7 @@
 # under the License.
 from __future__ import annotations
 
+import copy
 import logging
 import uuid
 from collections import defaultdict, deque
@@ -37,13 +38,14 @@ from sqlalchemy import (
     UniqueConstraint,
 )
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import relationship, subqueryload
+from sqlalchemy.orm import joinedload, relationship, subqueryload
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.sql.elements import BinaryExpression
 
 from superset import app, db, is_feature_enabled, security_manager
 from superset.connectors.sqla.models import BaseDatasource, SqlaTable
 from superset.daos.datasource import DatasourceDAO
+from superset.extensions import cache_manager
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.slice import Slice
 from superset.models.user_attributes import UserAttribute
@@ -51,6 +53,7 @@ from superset.tasks.thumbnails import cache_dashboard_thumbnail
 from superset.tasks.utils import get_current_user
 from superset.thumbnails.digest import get_dashboard_digest
 from superset.utils import core as utils, json
+from superset.utils.hashing import md5_sha_from_dict
 
 metadata = Model.metadata  # pylint: disable=no-member
 config = app.config
@@ -247,9 +250,7 @@ class Dashboard(AuditMixinNullable, ImportExportMixin, Model):
 
     @property
     def data(self) -> dict[str, Any]:
-        positions = self.position_json
-        if positions:
-            positions = json.loads(positions)
+        positions = self.position if self.position_json else self.position_json
         return {
             "id": self.id,
             "metadata": self.params_dict,
@@ -266,27 +267,147 @@ class Dashboard(AuditMixinNullable, ImportExportMixin, Model):
         }
 
     def datasets_trimmed_for_slices(self) -> list[dict[str, Any]]:
+        """
+        The datasources of the dashboard, trimmed to what its charts use.
+
+        The payload is kept in the metadata cache for
+        ``DASHBOARD_DATASETS_CACHE_TIMEOUT`` seconds, under a key of the charts and
+        the revisions of their datasources (see ``_query_datasource_revisions``),
+        so that opening the dashboard again only runs the revision queries.
+        """
         # Verbose but efficient database enumeration of dashboard datasources.
         slices_by_datasource: dict[tuple[type[BaseDatasource], int], set[Slice]] = (
             defaultdict(set)
         )
+        datasource_ids_by_cls_model: dict[type[BaseDatasource], set[int]] = defaultdict(
+            set
+        )
 
         for slc in self.slices:
             slices_by_datasource[(slc.cls_model, slc.datasource_id)].add(slc)
-
-        result: list[dict[str, Any]] = []
-
-        for (cls_model, datasource_id), slices in slices_by_datasource.items():
-            datasource = (
-                db.session.query(cls_model).filter_by(id=datasource_id).one_or_none()
+            datasource_ids_by_cls_model[slc.cls_model].add(slc.datasource_id)
+
+        if not slices_by_datasource:
+            return []
+
+        timeout = config["DASHBOARD_DATASETS_CACHE_TIMEOUT"]
+        cache_key = None
+        if timeout:
+            revisions = {
+                (cls_model, datasource_id): revision
+                for cls_model, datasource_ids in datasource_ids_by_cls_model.items()
+                for datasource_id, revision in self._query_datasource_revisions(
+                    cls_model, datasource_ids
+                ).items()
+            }
+            cache_key = "dashboard_datasets_" + md5_sha_from_dict(
+                {
+                    "dashboard_id": self.id,
+                    "datasources": [
+                        [
+                            cls_model.__name__,
+                            datasource_id,
+                            revisions.get((cls_model, datasource_id)),
+                            sorted((slc.id, slc.changed_on) for slc in slices),
+                        ]
+                        for (cls_model, datasource_id), slices in (
+                            slices_by_datasource.items()
+                        )
+                    ],
+                },
+                default=str,
+            )
+            try:
+                cached = cache_manager.cache.get(cache_key)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not read dashboard datasets key %s", cache_key)
+                cached = None
+            if cached is not None:
+                return cached
+
+        datasources = {
+            (cls_model, datasource.id): datasource
+            for cls_model, datasource_ids in datasource_ids_by_cls_model.items()
+            for datasource in self._query_datasources_for_slices(
+                cls_model, datasource_ids
             )
+        }
+        result: list[dict[str, Any]] = []
 
-            if datasource:
+        for key, slices in slices_by_datasource.items():
+            if datasource := datasources.get(key):
                 # Filter out unneeded fields from the datasource payload
                 result.append(datasource.data_for_slices(slices))
 
+        if cache_key:
+            try:
+                cache_manager.cache.set(cache_key, result, timeout=timeout)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not cache dashboard datasets key %s", cache_key)
         return result
 
+    @staticmethod
+    def _query_datasource_revisions(
+        cls_model: type[BaseDatasource],
+        datasource_ids: set[int],
+    ) -> dict[int, list[Any]]:
+        """
+        The revisions of datasources, by datasource id.
+
+        A revision is the ``changed_on`` of the datasource and of its database, and
+        the number and latest ``changed_on`` of its columns and of its metrics, as
+        these are edited without changing the datasource itself.
+        """
+        relationships = sqla.inspect(cls_model).relationships
+        query = db.session.query(cls_model.id, cls_model.changed_on)
+        if "database" in relationships:
+            database_model = relationships["database"].mapper.class_
+            query = query.outerjoin(cls_model.database).add_columns(
+                database_model.changed_on
+            )
+        revisions = {
+            datasource_id: list(revision)
+            for datasource_id, *revision in query.filter(
+                cls_model.id.in_(datasource_ids)
+            )
+        }
+        for name in ("columns", "metrics"):
+            if name not in relationships:
+                continue
+            child_model = relationships[name].mapper.class_
+            for datasource_id, count, changed_on in (
+                db.session.query(
+                    cls_model.id,
+                    sqla.func.count(child_model.id),
+                    sqla.func.max(child_model.changed_on),
+                )
+                .join(getattr(cls_model, name))
+                .filter(cls_model.id.in_(datasource_ids))
+                .group_by(cls_model.id)
+            ):
+                revisions.setdefault(datasource_id, []).extend(
+                    [name, count, changed_on]
+                )
+        return revisions
+
+    @staticmethod
+    def _query_datasources_for_slices(
+        cls_model: type[BaseDatasource],
+        datasource_ids: set[int],
+    ) -> list[BaseDatasource]:
+        """
+        Load datasources with the relationships ``data_for_slices`` reads, so that
+        they are not lazy loaded one datasource at a time.
+        """
+        query = db.session.query(cls_model).filter(cls_model.id.in_(datasource_ids))
+        relationships = sqla.inspect(cls_model).relationships
+        for name in ("columns", "metrics"):
+            if name in relationships:
+                query = query.options(subqueryload(getattr(cls_model, name)))
+        if "database" in relationships:
+            query = query.options(joinedload(cls_model.database))
+        return query.all()
+
     @property
     def params(self) -> str:
         return self.json_metadata
@@ -297,35 +418,50 @@ class Dashboard(AuditMixinNullable, ImportExportMixin, Model):
 
     @property
     def position(self) -> dict[str, Any]:
-        if self.position_json:
-            return json.loads(self.position_json)
-        return {}
+        """
+        The parsed layout, a new copy on every access that callers may mutate.
+        """
+        return json.loads(self.position_json) if self.position_json else {}
+
+    def _get_position(self) -> dict[str, Any]:
+        """
+        The parsed layout, parsed once per value of ``position_json``.
+
+        The layout is shared between calls, so it must not be mutated nor returned
+        to callers; use ``position`` for a copy.
+        """
+        position_json = self.position_json
+        cached = getattr(self, "_position_cache", None)
+        if cached is None or cached[0] != position_json:
+            position = json.loads(position_json) if position_json else {}
+            cached = self._position_cache = (position_json, position)
+        return cached[1]
 
     @property
     def tabs(self) -> dict[str, Any]:
-        if self.position == {}:
+        position = self._get_position()
+        if position == {}:
             return {}
 
-        def get_node(node_id: str) -> dict[str, Any]:
-            """
-            Helper function for getting a node from the position_data
-            """
-            return self.position[node_id]
-
-        def build_tab_tree(
-            node: dict[str, Any], children: list[dict[str, Any]]
-        ) -> None:
-            """
-            Function for building the tab tree structure and list of all tabs
-            """
+        tab_tree: list[dict[str, Any]] = []
+        all_tabs: dict[str, str] = {}
+        queue: deque[tuple[dict[str, Any], list[dict[str, Any]]]] = deque()
+        queue.append((position["ROOT_ID"], tab_tree))
+        while queue:
+            node, children = queue.popleft()
+            if node["type"] == "TAB" and node is position.get(node["id"]):
+                # tabs are returned with their children replaced, never change the
+                # shared layout
+                node = dict(node)
 
             new_children: list[dict[str, Any]] = []
             # new children to overwrite parent's children
             for child_id in node.get("children", []):
-                child = get_node(child_id)
+                child = position[child_id]
                 if node["type"] == "TABS":
-                    # if TABS add create a new list and append children to it
-                    # new_children.append(child)
+                    # if TABS add create a new list and append children to it; the
+                    # tabs are returned, so they must not share the cached layout
+                    child = copy.deepcopy(child)
                     children.append(child)
                     queue.append((child, new_children))
                 elif node["type"] in ["GRID", "ROOT"]:
@@ -338,15 +474,6 @@ class Dashboard(AuditMixinNullable, ImportExportMixin, Model):
                 node["value"] = node["id"]
                 all_tabs[node["id"]] = node["title"]
 
-        root = get_node("ROOT_ID")
-        tab_tree: list[dict[str, Any]] = []
-        all_tabs: dict[str, str] = {}
-        queue: deque[tuple[dict[str, Any], list[dict[str, Any]]]] = deque()
-        queue.append((root, tab_tree))
-        while queue:
-            node, children = queue.popleft()
-            build_tab_tree(node, children)
-
         return {"all_tabs": all_tabs, "tab_tree": tab_tree}
 
     def update_thumbnail(self) -> None:
@@ -22,6 +22,7 @@ from __future__ import annotations
 import builtins
 import dataclasses
 import logging
+import math
 import re
 import uuid
 from collections.abc import Hashable
@@ -66,7 +67,7 @@ from superset.exceptions import (
     QueryObjectValidationError,
     SupersetSecurityException,
 )
-from superset.extensions import feature_flag_manager
+from superset.extensions import cache_manager, feature_flag_manager
 from superset.jinja_context import BaseTemplateProcessor
 from superset.sql.parse import sanitize_clause, SQLScript, SQLStatement
 from superset.superset_typing import (
@@ -89,6 +90,7 @@ from superset.utils.core import (
     remove_duplicates,
 )
 from superset.utils.dates import datetime_to_epoch
+from superset.utils.hashing import md5_sha_from_dict
 from superset.utils.rls import apply_rls
 
 if TYPE_CHECKING:
@@ -164,6 +166,16 @@ def convert_uuids(obj: Any) -> Any:
     return obj
 
 
+def _is_plain_value(value: Any) -> bool:
+    """
+    Whether a prequery value can be matched in a plain ``IN`` list, i.e. it is
+    not null (``IN`` never matches nulls) and not a SQL expression.
+    """
+    if value is None or isinstance(value, sa.sql.ClauseElement):
+        return False
+    return not (isinstance(value, float) and math.isnan(value))
+
+
 class UUIDMixin:  # pylint: disable=too-few-public-methods
     uuid = sa.Column(
         UUIDType(binary=True), primary_key=False, unique=True, default=uuid.uuid4
@@ -895,54 +907,57 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
             sql=sql,
         )
 
-    def _normalize_prequery_result_type(
+    def _normalize_prequery_result_column(
         self,
-        row: pd.Series,
+        values: pd.Series,
         dimension: str,
         columns_by_name: dict[str, "TableColumn"],
-    ) -> Union[str, int, float, bool, str]:
+    ) -> list[Any]:
         """
-        Convert a prequery result type to its equivalent Python type.
+        Convert a prequery result column to its equivalent Python values.
 
         Some databases like Druid will return timestamps as strings, but do not perform
         automatic casting when comparing these strings to a timestamp. For cases like
-        this we convert the value via the appropriate SQL transform.
+        this we convert the value via the appropriate SQL transform. Numpy scalars are
+        converted in one pass and each distinct temporal string is only converted once.
 
-        :param row: A prequery record
+        :param values: A prequery result column
         :param dimension: The dimension name
         :param columns_by_name: The mapping of columns by name
-        :return: equivalent primitive python type
+        :return: equivalent primitive python values
         """
-
-        value = row[dimension]
-
-        if isinstance(value, np.generic):
-            value = value.item()
+        result = values.tolist()
+        if values.dtype == object:
+            result = [
+                value.item() if isinstance(value, np.generic) else value
+                for value in result
+            ]
 
         column_ = columns_by_name[dimension]
-        db_extra: dict[str, Any] = self.database.get_extra()
-
         if isinstance(column_, dict):
-            if (
-                column_.get("type")
-                and column_.get("is_temporal")
-                and isinstance(value, str)
-            ):
-                sql = self.db_engine_spec.convert_dttm(
-                    column_.get("type"), dateutil.parser.parse(value), db_extra=None
-                )
-
-                if sql:
-                    value = self.db_engine_spec.get_text_clause(sql)
+            type_ = column_.get("type")
+            is_temporal = column_.get("is_temporal")
+            db_extra = None
+            to_clause = self.db_engine_spec.get_text_clause
         else:
-            if column_.type and column_.is_temporal and isinstance(value, str):
+            type_ = column_.type
+            is_temporal = column_.is_temporal
+            db_extra = self.database.get_extra()
+            to_clause = self.text
+        if not (type_ and is_temporal):
+            return result
+
+        converted: dict[str, Any] = {}
+        for i, value in enumerate(result):
+            if not isinstance(value, str):
+                continue
+            if value not in converted:
                 sql = self.db_engine_spec.convert_dttm(
-                    column_.type, dateutil.parser.parse(value), db_extra=db_extra
+                    type_, dateutil.parser.parse(value), db_extra=db_extra
                 )
-
-                if sql:
-                    value = self.text(sql)
-        return value
+                converted[value] = to_clause(sql) if sql else value
+            result[i] = converted[value]
+        return result
 
     def make_orderby_compatible(
         self, select_exprs: list[ColumnElement], orderby_exprs: list[ColumnElement]
@@ -973,9 +988,14 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
             if is_alias_used_in_orderby(col):
                 col.name = f"{col.name}__"
 
-    def exc_query(self, qry: Any) -> QueryResult:
+    def exc_query(
+        self,
+        qry: Any,
+        query_str_ext: Optional[QueryStringExtended] = None,
+    ) -> QueryResult:
         qry_start_dttm = datetime.now()
-        query_str_ext = self.get_query_str_extended(qry)
+        if query_str_ext is None:
+            query_str_ext = self.get_query_str_extended(qry)
         sql = query_str_ext.sql
         status = QueryStatus.SUCCESS
         errors = None
@@ -1240,21 +1260,105 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
         groupby_exprs: dict[str, Any],
         columns_by_name: dict[str, "TableColumn"],
     ) -> ColumnElement:
-        groups = []
-        for _unused, row in df.iterrows():
-            group = []
-            for dimension in dimensions:
-                value = self._normalize_prequery_result_type(
-                    row,
-                    dimension,
-                    columns_by_name,
+        """
+        Build the predicate restricting the main query to the prequery groups.
+
+        Groups of plain values are matched with a single ``IN`` (a row-value
+        ``IN`` for several dimensions, on engines listed in
+        ``SERIES_LIMIT_TUPLE_IN_ENGINES``) instead of an ``OR`` of ``AND``s.
+        Groups with nulls or SQL expressions still get their own ``AND`` term.
+        """
+        exprs = [groupby_exprs[dimension] for dimension in dimensions]
+        rows = list(
+            zip(
+                *(
+                    self._normalize_prequery_result_column(
+                        df[dimension],
+                        dimension,
+                        columns_by_name,
+                    )
+                    for dimension in dimensions
                 )
+            )
+        )
+
+        def match(row: tuple[Any, ...]) -> ColumnElement:
+            return and_(*(expr == value for expr, value in zip(exprs, row)))
 
-                group.append(groupby_exprs[dimension] == value)
-            groups.append(and_(*group))
+        if len(rows) < 2 or (
+            len(exprs) > 1
+            and self.db_engine_spec.engine
+            not in config["SERIES_LIMIT_TUPLE_IN_ENGINES"]
+        ):
+            return or_(*(match(row) for row in rows))
 
+        plain_rows = []
+        groups = []
+        for row in rows:
+            if all(_is_plain_value(value) for value in row):
+                plain_rows.append(row)
+            else:
+                groups.append(match(row))
+
+        if plain_rows and len(exprs) == 1:
+            groups.insert(0, exprs[0].in_([row[0] for row in plain_rows]))
+        elif plain_rows:
+            groups.insert(0, sa.tuple_(*exprs).in_(plain_rows))
         return or_(*groups)
 
+    def _run_series_limit_prequery(
+        self,
+        prequery_obj: QueryObjectDict,
+    ) -> tuple[pd.DataFrame, str]:
+        """
+        Run the series limit prequery, caching its result in the data cache under
+        a key of its own SQL for ``SERIES_LIMIT_PREQUERY_CACHE_TIMEOUT`` seconds.
+
+        The key includes the effective user when the database impersonates users,
+        as the result then depends on who runs it. The prequery is compiled once,
+        and that SQL is both the key and the query run, cached or not.
+
+        :param prequery_obj: the prequery object
+        :returns: the prequery result and its SQL
+        """
+        query_str_ext = self.get_query_str_extended(prequery_obj)
+        timeout = config["SERIES_LIMIT_PREQUERY_CACHE_TIMEOUT"]
+        if not timeout:
+            result = self.exc_query(prequery_obj, query_str_ext=query_str_ext)
+            return result.df, result.query
+
+        username = None
+        if self.database.impersonate_user:
+            username = self.database.get_effective_user(self.database.url_object)
+        cache_key = "series_limit_prequery_" + md5_sha_from_dict(
+            {
+                "database_id": self.database.id,
+                "catalog": self.catalog,
+                "schema": self.schema,
+                "sql": query_str_ext.sql,
+                "username": username,
+            }
+        )
+        try:
+            cached = cache_manager.data_cache.get(cache_key)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not read prequery cache key %s", cache_key)
+            cached = None
+        if cached is not None:
+            return cached["df"], cached["query"]
+
+        result = self.exc_query(prequery_obj, query_str_ext=query_str_ext)
+        if result.status == QueryStatus.SUCCESS:
+            try:
+                cache_manager.data_cache.set(
+                    cache_key,
+                    {"df": result.df, "query": result.query},
+                    timeout=timeout,
+                )
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not cache prequery key %s", cache_key)
+        return result.df, result.query
+
     def dttm_sql_literal(self, dttm: datetime, col: "TableColumn") -> str:
         """Convert datetime object to a SQL expression string"""
 
@@ -2062,15 +2166,17 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
                     "order_desc": True,
                 }
 
-                result = self.query(prequery_obj)
-                prequeries.append(result.query)
+                prequery_df, prequery_sql = self._run_series_limit_prequery(
+                    prequery_obj
+                )
+                prequeries.append(prequery_sql)
                 dimensions = [
                     c
-                    for c in result.df.columns
+                    for c in prequery_df.columns
                     if c not in metrics and c in groupby_series_columns
                 ]
                 top_groups = self._get_top_groups(
-                    result.df, dimensions, groupby_series_columns, columns_by_name
+                    prequery_df, dimensions, groupby_series_columns, columns_by_name
                 )
                 qry = qry.where(top_groups)
 
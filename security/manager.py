@@ -68,6 +68,11 @@ from superset.security.guest_token import (
     GuestTokenUser,
     GuestUser,
 )
+from superset.security.permission_snapshot import (
+    permission_snapshot_cache,
+    PermissionSnapshot,
+)
+from superset.security.rls_cache import rls_filter_cache, RLSFilter
 from superset.sql.parse import extract_tables_from_jinja_sql, Table
 from superset.tasks.utils import get_current_user
 from superset.utils import json
@@ -474,11 +479,84 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :returns: Whether the user can access the FAB permission/view
         """
 
+        if snapshot := self.get_permission_snapshot():
+            return (permission_name, view_name) in snapshot
+
         user = g.user
         if user.is_anonymous:
             return self.is_item_public(permission_name, view_name)
         return self._has_view_access(user, permission_name, view_name)
 
+    def get_permission_snapshot(self) -> Optional[PermissionSnapshot]:
+        """
+        Return the compiled (permission, view menu) pairs of the current user.
+
+        Snapshots are built with a single query and shared across requests and workers
+        through ``permission_snapshot_cache``. They are not used for guest users, or
+        when builtin roles are configured since those match permissions by regex.
+
+        :returns: The permission snapshot, or None if snapshots do not apply
+        """
+        if not current_app.config["PERMISSION_SNAPSHOT_TTL"] or self.builtin_roles:
+            return None
+
+        user = g.user
+        if user.is_anonymous:
+            return permission_snapshot_cache.get(
+                "anonymous",
+                lambda: self._get_permission_pairs(None),
+            )
+        if self.is_guest_user(user):
+            return None
+
+        role_ids = sorted(role.id for role in user.roles)
+        group_ids = sorted(group.id for group in getattr(user, "groups", None) or [])
+        return permission_snapshot_cache.get(
+            f"{user.id}:{role_ids}:{group_ids}",
+            lambda: self._get_permission_pairs(user.id),
+        )
+
+    def _get_permission_pairs(self, user_id: Optional[int]) -> list[tuple[str, str]]:
+        """
+        Return all (permission, view menu) pairs granted to a user through their roles
+        and groups, or to the public role when ``user_id`` is None.
+        """
+        query = (
+            self.get_session.query(self.permission_model.name, self.viewmenu_model.name)
+            .select_from(self.viewmenu_model)
+            .join(self.permissionview_model)
+            .join(self.permission_model)
+            .join(assoc_permissionview_role)
+            .join(self.role_model)
+        )
+
+        if user_id is None:
+            if not (public_role := self.get_public_role()):
+                return []
+            query = query.filter(self.role_model.id == public_role.id)
+        else:
+            query = query.filter(
+                or_(
+                    exists().where(
+                        (assoc_user_role.c.user_id == user_id)
+                        & (assoc_user_role.c.role_id == self.role_model.id)
+                    ),
+                    exists().where(
+                        (assoc_user_group.c.user_id == user_id)
+                        & (assoc_user_group.c.group_id == self.group_model.id)
+                        & (assoc_group_role.c.group_id == self.group_model.id)
+                        & (assoc_group_role.c.role_id == self.role_model.id)
+                    ),
+                )
+            )
+
+        return [(row[0], row[1]) for row in query.distinct()]
+
+    def _invalidate_permission_snapshots(self) -> None:
+        permission_snapshot_cache.invalidate()
+        # bump the shared version again on commit, once other workers see the change
+        self.get_session.info["permissions_changed"] = True
+
     def can_access_all_queries(self) -> bool:
         """
         Return True if the user can access all SQL Lab queries, False otherwise.
@@ -763,6 +841,9 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return True
 
     def user_view_menu_names(self, permission_name: str) -> set[str]:
+        if snapshot := self.get_permission_snapshot():
+            return set(snapshot.view_menu_names(permission_name))
+
         base_query = (
             self.get_session.query(self.viewmenu_model.name)
             .join(self.permissionview_model)
@@ -2100,6 +2181,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being changed
         """
+        self._invalidate_permission_snapshots()
 
     def on_view_menu_after_insert(
         self, mapper: Mapper, connection: Connection, target: ViewMenu
@@ -2132,6 +2214,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        self._invalidate_permission_snapshots()
 
     def on_permission_after_insert(
         self, mapper: Mapper, connection: Connection, target: Permission
@@ -2164,6 +2247,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        self._invalidate_permission_snapshots()
 
     def on_permission_view_after_delete(
         self, mapper: Mapper, connection: Connection, target: PermissionView
@@ -2180,6 +2264,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        self._invalidate_permission_snapshots()
 
     @staticmethod
     def get_exclude_users_from_lists() -> list[str]:
@@ -2496,11 +2581,14 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             ]
         return []
 
-    def get_rls_filters(self, table: "BaseDatasource") -> list[SqlaQuery]:
+    def get_rls_filters(self, table: "BaseDatasource") -> list[RLSFilter]:
         """
         Retrieves the appropriate row level security filters for the current user and
         the passed table.
 
+        Results are served from ``rls_filter_cache`` per role set and table, see
+        ``RLS_FILTER_CACHE_TTL``.
+
         :param table: The table to check against
         :returns: A list of filters
         """
@@ -2508,6 +2596,18 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         if not (hasattr(g, "user") and g.user is not None):
             return []
 
+        user_roles = [role.id for role in self.get_user_roles(g.user)]
+        return rls_filter_cache.get(
+            user_roles,
+            table.id,
+            lambda: self._get_rls_filters_query(user_roles, table.id).all(),
+        )
+
+    def _get_rls_filters_query(
+        self,
+        user_roles: list[int],
+        table_id: int,
+    ) -> SqlaQuery:
         # pylint: disable=import-outside-toplevel
         from superset.connectors.sqla.models import (
             RLSFilterRoles,
@@ -2515,7 +2615,6 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             RowLevelSecurityFilter,
         )
 
-        user_roles = [role.id for role in self.get_user_roles(g.user)]
         regular_filter_roles = (
             self.get_session.query(RLSFilterRoles.c.rls_filter_id)
             .join(RowLevelSecurityFilter)
@@ -2533,9 +2632,9 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             .filter(RLSFilterRoles.c.role_id.in_(user_roles))
         )
         filter_tables = self.get_session.query(RLSFilterTables.c.rls_filter_id).filter(
-            RLSFilterTables.c.table_id == table.id
+            RLSFilterTables.c.table_id == table_id
         )
-        query = (
+        return (
             self.get_session.query(
                 RowLevelSecurityFilter.id,
                 RowLevelSecurityFilter.group_key,
@@ -2557,7 +2656,6 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
                 )
             )
         )
-        return query.all()
 
     def get_rls_sorted(self, table: "BaseDatasource") -> list["RowLevelSecurityFilter"]:
         """
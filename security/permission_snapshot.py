@@ -0,0 +1,237 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compiled per-user permission snapshots.
+
+A snapshot is the full set of (permission, view menu) pairs granted to a user through
+their roles and groups, loaded with a single query. Snapshots are keyed on the user
+and their role/group ids, and tagged with a permissions version stored in the shared
+cache backend. The version is bumped whenever roles, groups or permission views change,
+which drops every snapshot in every worker. With a ``NullCache`` other workers would
+never see the version change, so snapshots are then only kept for the request.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from flask import current_app, g, has_app_context
+from flask_appbuilder.security.sqla.models import (
+    Group,
+    PermissionView,
+    Role,
+    ViewMenu,
+)
+from flask_caching.backends import NullCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+PERMISSIONS_VERSION_CACHE_KEY = "permissions_version"
+PERMISSION_SNAPSHOT_CACHE_KEY = "permission_snapshot:{key}:{version}"
+
+
+@dataclass(frozen=True)
+class PermissionSnapshot:
+    """
+    Immutable set of (permission name, view menu name) pairs of a user.
+    """
+
+    permissions: frozenset[tuple[str, str]]
+    view_menus: dict[str, frozenset[str]] = field(compare=False, repr=False)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[str, str]]) -> PermissionSnapshot:
+        permissions = frozenset((str(perm), str(view)) for perm, view in pairs)
+        view_menus: dict[str, set[str]] = {}
+        for permission_name, view_menu_name in permissions:
+            view_menus.setdefault(permission_name, set()).add(view_menu_name)
+        return cls(
+            permissions=permissions,
+            view_menus={perm: frozenset(views) for perm, views in view_menus.items()},
+        )
+
+    def __contains__(self, item: object) -> bool:
+        return item in self.permissions
+
+    def view_menu_names(self, permission_name: str) -> frozenset[str]:
+        return self.view_menus.get(permission_name, frozenset())
+
+
+class PermissionSnapshotCache:
+    """
+    Three tiers of snapshots: the request (``g``), an in-process LRU and the shared
+    cache backend. Only a miss in all three runs the permissions query.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Any, float, PermissionSnapshot]] = (
+            OrderedDict()
+        )
+        self._local_version = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _get_cache() -> Any:
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        return cache_manager.cache
+
+    def _get_version(self) -> tuple[int, Any]:
+        if not hasattr(g, "permissions_version"):
+            try:
+                shared = self._get_cache().get(PERMISSIONS_VERSION_CACHE_KEY)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not read the permissions version", exc_info=True)
+                shared = None
+            g.permissions_version = shared
+        return self._local_version, g.permissions_version
+
+    def get(
+        self,
+        key: str,
+        loader: Callable[[], Iterable[tuple[str, str]]],
+    ) -> PermissionSnapshot:
+        """
+        Return the snapshot for ``key``, calling ``loader`` only on a full miss.
+
+        :param key: identifies the user and the roles/groups granting permissions
+        :param loader: returns the (permission name, view menu name) pairs
+        """
+        snapshots = g.setdefault("permission_snapshots", {})
+        if snapshot := snapshots.get(key):
+            return snapshot
+
+        ttl = current_app.config["PERMISSION_SNAPSHOT_TTL"]
+        if isinstance(self._get_cache().cache, NullCache):
+            self.misses += 1
+            snapshots[key] = PermissionSnapshot.from_pairs(loader())
+            return snapshots[key]
+
+        version = self._get_version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and now - entry[1] < ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                snapshots[key] = entry[2]
+                return entry[2]
+
+        cache_key = PERMISSION_SNAPSHOT_CACHE_KEY.format(key=key, version=version[1])
+        pairs = None
+        try:
+            pairs = self._get_cache().get(cache_key)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not read permission snapshot", exc_info=True)
+
+        if pairs is None:
+            self.misses += 1
+            pairs = [tuple(pair) for pair in loader()]
+            try:
+                self._get_cache().set(cache_key, pairs, timeout=ttl)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not store permission snapshot", exc_info=True)
+        else:
+            self.hits += 1
+
+        snapshot = PermissionSnapshot.from_pairs(pairs)
+        with self._lock:
+            if version[0] == self._local_version:
+                self._entries[key] = (version, now, snapshot)
+                self._entries.move_to_end(key)
+                max_size = current_app.config["PERMISSION_SNAPSHOT_MAX_SIZE"]
+                while len(self._entries) > max_size:
+                    self._entries.popitem(last=False)
+        snapshots[key] = snapshot
+        return snapshot
+
+    def invalidate(self, shared: bool = True) -> None:
+        """
+        Drop all snapshots.
+
+        :param shared: also bump the version in the shared cache backend, making every
+            worker drop its snapshots
+        """
+        with self._lock:
+            self._local_version += 1
+            self._entries.clear()
+        if has_app_context():
+            g.pop("permissions_version", None)
+            g.pop("permission_snapshots", None)
+
+        if shared:
+            try:
+                self._get_cache().set(
+                    PERMISSIONS_VERSION_CACHE_KEY,
+                    uuid.uuid4().hex,
+                    timeout=0,
+                )
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not bump the permissions version", exc_info=True)
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "version": self._local_version,
+            }
+
+
+permission_snapshot_cache = PermissionSnapshotCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _permissions_after_flush(session: Session, flush_context: Any) -> None:
+    """
+    Catch role, group, permission view and view menu changes made through the
+    session. Changing the roles of a group marks the group (or the role) as dirty.
+
+    Changes to the roles and groups of a user need no invalidation: snapshots are
+    keyed on the user's role and group ids.
+    """
+    if any(
+        isinstance(obj, (Group, Role, PermissionView, ViewMenu))
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        permission_snapshot_cache.invalidate(shared=False)
+        session.info["permissions_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _permissions_after_commit(session: Session) -> None:
+    # bump the shared version again once the change is visible to other workers
+    if session.info.pop("permissions_changed", False):
+        permission_snapshot_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _permissions_after_rollback(session: Session) -> None:
+    if session.info.pop("permissions_changed", False):
+        permission_snapshot_cache.invalidate(shared=False)
@@ -0,0 +1,198 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+In-process index of row level security filters.
+
+``SupersetSecurityManager.get_rls_filters`` is called several times per chart, so
+its result is kept here per (role set, table id). Entries are tagged with a version
+that is bumped whenever RLS filters change: locally right after the flush, and in
+the shared cache backend on commit so that other workers drop their entries too. The
+shared version is read at most once per request. With a ``NullCache`` other workers
+would never see the version change, so nothing is cached.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, NamedTuple
+
+from flask import current_app, g, has_app_context
+from flask_caching.backends import NullCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+RLS_FILTERS_VERSION_CACHE_KEY = "rls_filters_version"
+
+
+class RLSFilter(NamedTuple):
+    id: int
+    group_key: str | None
+    clause: str
+
+
+class RLSFilterCache:
+    """
+    Versioned LRU of RLS filters keyed by (role ids, table id).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[
+            tuple[frozenset[int], int],
+            tuple[tuple[int, Any], float, tuple[RLSFilter, ...]],
+        ] = OrderedDict()
+        self._local_version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _get_shared_version(self) -> Any:
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        if hasattr(g, "rls_filters_version"):
+            return g.rls_filters_version
+
+        try:
+            version = cache_manager.cache.get(RLS_FILTERS_VERSION_CACHE_KEY)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not read the RLS filters version", exc_info=True)
+            version = None
+        g.rls_filters_version = version
+        return version
+
+    def get(
+        self,
+        role_ids: Iterable[int],
+        table_id: int,
+        loader: Callable[[], Iterable[Any]],
+    ) -> list[RLSFilter]:
+        """
+        Return the filters for a role set and table, calling ``loader`` on a miss.
+
+        ``loader`` returns rows with ``id``, ``group_key`` and ``clause``. A new list
+        is returned on every call, so callers may sort or extend it.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        ttl = current_app.config["RLS_FILTER_CACHE_TTL"]
+        if not ttl or isinstance(cache_manager.cache.cache, NullCache):
+            return [RLSFilter(row.id, row.group_key, row.clause) for row in loader()]
+
+        stats_logger = current_app.config["STATS_LOGGER"]
+        key = (frozenset(role_ids), table_id)
+        version = (self._local_version, self._get_shared_version())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and now - entry[1] < ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                stats_logger.incr("rls_filter_cache.hit")
+                return list(entry[2])
+            self.misses += 1
+
+        stats_logger.incr("rls_filter_cache.miss")
+        filters = tuple(
+            RLSFilter(row.id, row.group_key, row.clause) for row in loader()
+        )
+        with self._lock:
+            # a change while loading bumps the local version; do not store stale data
+            if version[0] == self._local_version:
+                self._entries[key] = (version, now, filters)
+                self._entries.move_to_end(key)
+                max_size = current_app.config["RLS_FILTER_CACHE_MAX_SIZE"]
+                while len(self._entries) > max_size:
+                    self._entries.popitem(last=False)
+        return list(filters)
+
+    def invalidate(self, shared: bool = False) -> None:
+        """
+        Drop all cached filters.
+
+        :param shared: also bump the version in the shared cache backend, making
+            every other worker drop its entries
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        with self._lock:
+            self._local_version += 1
+            self._entries.clear()
+        if has_app_context():
+            g.pop("rls_filters_version", None)
+
+        if shared:
+            try:
+                cache_manager.cache.set(
+                    RLS_FILTERS_VERSION_CACHE_KEY,
+                    uuid.uuid4().hex,
+                    timeout=0,
+                )
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not bump the RLS filters version", exc_info=True)
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "version": self._local_version,
+            }
+
+
+rls_filter_cache = RLSFilterCache()
+
+
+def _is_rls_model(obj: Any) -> bool:
+    # pylint: disable=import-outside-toplevel
+    from superset.connectors.sqla.models import RowLevelSecurityFilter
+
+    return isinstance(obj, RowLevelSecurityFilter)
+
+
+@event.listens_for(Session, "after_flush")
+def _rls_after_flush(session: Session, flush_context: Any) -> None:
+    """
+    Invalidate on any change to a filter, including its ``roles`` and ``tables``
+    collections, which is how the ``RLSFilterRoles`` and ``RLSFilterTables``
+    association rows are written.
+    """
+    if any(
+        _is_rls_model(obj) for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        rls_filter_cache.invalidate()
+        session.info["rls_filters_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _rls_after_commit(session: Session) -> None:
+    if session.info.pop("rls_filters_changed", False):
+        rls_filter_cache.invalidate(shared=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _rls_after_rollback(session: Session) -> None:
+    if session.info.pop("rls_filters_changed", False):
+        rls_filter_cache.invalidate()
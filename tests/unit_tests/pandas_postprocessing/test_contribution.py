@@ -0,0 +1,59 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from decimal import Decimal
+
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+from pandas import DataFrame
+
+from superset.utils.core import PostProcessingContributionOrientation
+from superset.utils.pandas_postprocessing import contribution
+
+
+def test_contribution_row_decimal():
+    df = DataFrame({"a": [Decimal("1.5"), Decimal("2")], "b": [Decimal("1"), None]})
+    processed_df = contribution(
+        df,
+        orientation=PostProcessingContributionOrientation.ROW,
+        rename_columns=["pct_a", "pct_b"],
+    )
+    assert processed_df["pct_a"].tolist() == [Decimal("0.6"), Decimal("1")]
+    assert processed_df["pct_b"].tolist()[0] == Decimal("0.4")
+    assert np.isnan(processed_df["pct_b"].tolist()[1])
+
+
+def test_contribution_row_decimal_and_int():
+    df = DataFrame({"a": [Decimal("1.5"), Decimal("2")], "b": [1, 2]})
+    processed_df = contribution(
+        df,
+        orientation=PostProcessingContributionOrientation.ROW,
+        rename_columns=["pct_a", "pct_b"],
+    )
+    assert_array_almost_equal(processed_df["pct_a"].tolist(), [0.6, 0.5])
+    assert_array_almost_equal(processed_df["pct_b"].tolist(), [0.4, 0.5])
+
+
+def test_contribution_row_decimal_and_float_with_nulls():
+    df = DataFrame({"a": [Decimal("3"), None], "b": [1.0, np.nan]})
+    processed_df = contribution(
+        df,
+        orientation=PostProcessingContributionOrientation.ROW,
+        rename_columns=["pct_a", "pct_b"],
+    )
+    assert_array_almost_equal(processed_df["pct_a"].tolist(), [0.75, np.nan])
+    assert_array_almost_equal(processed_df["pct_b"].tolist(), [0.25, np.nan])
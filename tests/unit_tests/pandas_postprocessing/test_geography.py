@@ -0,0 +1,34 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import geohash as geohash_lib
+from pandas import DataFrame
+
+from superset.utils.pandas_postprocessing import geohash_decode
+
+
+def test_geohash_decode_uppercase():
+    geohashes = ["U4PRUYDQQVJ", "EZS42", "ezs42"]
+    post_df = geohash_decode(
+        df=DataFrame({"geohash": geohashes}),
+        geohash="geohash",
+        latitude="latitude",
+        longitude="longitude",
+    )
+    assert list(zip(post_df["latitude"], post_df["longitude"])) == [
+        geohash_lib.decode(value) for value in geohashes
+    ]
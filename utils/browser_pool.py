@@ -0,0 +1,348 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Per-process pool of long-lived browsers for screenshots.
+
+Launching a browser takes seconds and hundreds of MB, so with
+``SCREENSHOT_BROWSER_POOL_ENABLED`` the webdrivers check browsers out of this pool
+instead of launching one per screenshot. User state is isolated per checkout by the
+webdrivers (a new browser context for Playwright, cleared cookies, storage and cache
+for Selenium Chrome, drivers kept per user for Selenium Firefox); the pool bounds
+concurrency, health checks browsers and recycles them after
+``SCREENSHOT_BROWSER_MAX_USES`` screenshots or when the browser processes of the
+worker grow beyond ``SCREENSHOT_BROWSER_POOL_MAX_MEMORY_MB``.
+
+Idle browsers of all threads are kept in one registry, so that browsers of
+per-thread pools left behind by threads that exited, which cannot be closed through
+their API from another thread, have their processes terminated by the next
+checkout.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+except ModuleNotFoundError:
+    psutil = None
+
+# serializes launches of all pools, so that the processes a launch starts can be
+# told apart from the ones of other launches
+_launch_lock = threading.Lock()
+
+
+@dataclass
+class _PooledBrowser:
+    browser: Any
+    close: Callable[[Any], None]
+    last_used: float
+    uses: int = 0
+    # the thread the browser is bound to, for per-thread pools
+    owner: threading.Thread | None = None
+    # the processes started by the launch, as (pid, create time)
+    processes: list[tuple[int, float]] = field(default_factory=list)
+
+
+def get_browser_memory_mb() -> float | None:
+    """
+    Return the resident memory of all child processes (the browsers and their
+    drivers) of this worker, or ``None`` without psutil.
+    """
+    if psutil is None:
+        return None
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / 1024 / 1024
+
+
+def _get_child_processes() -> dict[int, float]:
+    processes = {}
+    for child in psutil.Process().children():
+        try:
+            processes[child.pid] = child.create_time()
+        except psutil.Error:
+            continue
+    return processes
+
+
+def _terminate_processes(processes: list[tuple[int, float]]) -> None:
+    """
+    Terminate processes and their children, skipping pids that were reused.
+    """
+    to_terminate = []
+    for pid, create_time in processes:
+        try:
+            process = psutil.Process(pid)
+            if process.create_time() != create_time:
+                continue
+            to_terminate += [*process.children(recursive=True), process]
+        except psutil.Error:
+            continue
+    for process in to_terminate:
+        try:
+            process.terminate()
+        except psutil.Error:
+            continue
+    _, alive = psutil.wait_procs(to_terminate, timeout=5)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            continue
+
+
+class BrowserPool:
+    """
+    Idle browsers keyed by browser type, with at most
+    ``SCREENSHOT_BROWSER_POOL_SIZE`` checked out at a time.
+
+    Playwright's sync API can only be used from the thread that started it, so
+    its browsers are pooled per thread (``per_thread=True``): a thread only checks
+    out the browsers it launched, and the browsers of threads that exited have
+    their processes terminated.
+    """
+
+    def __init__(self, per_thread: bool = False) -> None:
+        self._per_thread = per_thread
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # browsers inherited from the parent process belong to it; drop them
+        self._lock = threading.Lock()
+        self._semaphore: threading.BoundedSemaphore | None = None
+        self._idle: dict[Hashable, list[_PooledBrowser]] = {}
+        self.launches = 0
+        self.recycles = 0
+
+    def _get_semaphore(self) -> threading.BoundedSemaphore:
+        with self._lock:
+            if self._semaphore is None:
+                self._semaphore = threading.BoundedSemaphore(
+                    current_app.config["SCREENSHOT_BROWSER_POOL_SIZE"]
+                )
+            return self._semaphore
+
+    def _get_owner(self) -> threading.Thread | None:
+        return threading.current_thread() if self._per_thread else None
+
+    def _take_idle(
+        self,
+        should_take: Callable[[_PooledBrowser], bool],
+    ) -> list[_PooledBrowser]:
+        """
+        Remove the idle browsers of the current thread (of all threads, for shared
+        pools) for which ``should_take`` is true, and the ones of threads that
+        exited. Must be called with the lock held.
+        """
+        owner = self._get_owner()
+        taken = []
+        for entries in self._idle.values():
+            kept = []
+            for entry in entries:
+                if (entry.owner is owner and should_take(entry)) or (
+                    entry.owner is not None and not entry.owner.is_alive()
+                ):
+                    taken.append(entry)
+                else:
+                    kept.append(entry)
+            entries[:] = kept
+        return taken
+
+    def _pop_idle(
+        self,
+        key: Hashable,
+        is_alive: Callable[[Any], bool],
+    ) -> _PooledBrowser | None:
+        idle_timeout = current_app.config["SCREENSHOT_BROWSER_IDLE_TIMEOUT"]
+        now = time.monotonic()
+        owner = self._get_owner()
+        with self._lock:
+            expired = self._take_idle(lambda e: now - e.last_used > idle_timeout)
+            entries = self._idle.get(key, [])
+            entry = next(
+                (e for e in reversed(entries) if e.owner is owner),
+                None,
+            )
+            if entry is not None:
+                entries.remove(entry)
+
+        for expired_entry in expired:
+            self._close(expired_entry)
+        if entry is not None and not self._is_alive(entry, is_alive):
+            logger.info("Pooled browser %s is not responding, relaunching", key)
+            self._close(entry)
+            entry = None
+        return entry
+
+    @staticmethod
+    def _is_alive(entry: _PooledBrowser, is_alive: Callable[[Any], bool]) -> bool:
+        try:
+            return is_alive(entry.browser)
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    def _should_recycle(self, entry: _PooledBrowser) -> bool:
+        if entry.uses >= current_app.config["SCREENSHOT_BROWSER_MAX_USES"]:
+            return True
+        max_memory_mb = current_app.config["SCREENSHOT_BROWSER_POOL_MAX_MEMORY_MB"]
+        if max_memory_mb and (memory_mb := get_browser_memory_mb()) is not None:
+            if memory_mb > max_memory_mb:
+                logger.info(
+                    "Browsers use %i MB, more than %i MB, recycling one",
+                    memory_mb,
+                    max_memory_mb,
+                )
+                return True
+        return False
+
+    @staticmethod
+    def _reset_browser(
+        entry: _PooledBrowser,
+        reset: Callable[[Any], None] | None,
+    ) -> bool:
+        if reset is None:
+            return True
+        try:
+            reset(entry.browser)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to reset pooled browser", exc_info=True)
+            return False
+        return True
+
+    def _launch(
+        self,
+        launch: Callable[[], Any],
+        close: Callable[[Any], None],
+    ) -> _PooledBrowser:
+        owner = self._get_owner()
+        if psutil is None:
+            return _PooledBrowser(launch(), close, time.monotonic(), owner=owner)
+
+        with _launch_lock:
+            before = _get_child_processes()
+            browser = launch()
+            processes = [
+                (pid, create_time)
+                for pid, create_time in _get_child_processes().items()
+                if before.get(pid) != create_time
+            ]
+        return _PooledBrowser(
+            browser, close, time.monotonic(), owner=owner, processes=processes
+        )
+
+    def _close(self, entry: _PooledBrowser) -> None:
+        self.recycles += 1
+        if entry.owner not in (None, threading.current_thread()):
+            # the browser can only be closed by its thread, which exited
+            if psutil is None:
+                logger.warning(
+                    "Cannot close a pooled browser of an exited thread without psutil"
+                )
+                return
+            logger.info("Terminating a pooled browser of an exited thread")
+            _terminate_processes(entry.processes)
+            return
+        try:
+            entry.close(entry.browser)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to close pooled browser", exc_info=True)
+
+    @contextmanager
+    def checkout(
+        self,
+        key: Hashable,
+        launch: Callable[[], Any],
+        close: Callable[[Any], None],
+        is_alive: Callable[[Any], bool],
+        reset: Callable[[Any], None] | None = None,
+    ) -> Iterator[Any]:
+        """
+        Check out a browser, launching one if none of type ``key`` is idle.
+
+        A browser whose use raises is closed rather than returned to the pool, as
+        its state is unknown.
+
+        :param key: the type of browser, browsers are only reused for the same key
+        :param launch: starts a new browser
+        :param close: closes a browser
+        :param is_alive: health check run before an idle browser is reused
+        :param reset: clears the state of a browser before it is returned to the
+            pool; a browser whose reset fails is closed instead
+        """
+        semaphore = self._get_semaphore()
+        semaphore.acquire()
+        try:
+            entry = self._pop_idle(key, is_alive)
+            if entry is None:
+                logger.debug("Launching a pooled browser for %s", key)
+                entry = self._launch(launch, close)
+                self.launches += 1
+
+            healthy = False
+            try:
+                yield entry.browser
+                healthy = self._reset_browser(entry, reset)
+            finally:
+                entry.uses += 1
+                entry.last_used = time.monotonic()
+                if healthy and not self._should_recycle(entry):
+                    with self._lock:
+                        self._idle.setdefault(key, []).append(entry)
+                else:
+                    self._close(entry)
+        finally:
+            semaphore.release()
+
+    def clear(self) -> None:
+        """
+        Close all idle browsers (of the current thread and of threads that exited,
+        for per-thread pools).
+        """
+        with self._lock:
+            entries = self._take_idle(lambda _: True)
+        for entry in entries:
+            self._close(entry)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "idle": sum(len(entries) for entries in self._idle.values()),
+                "launches": self.launches,
+                "recycles": self.recycles,
+                "memory_mb": get_browser_memory_mb(),
+            }
+
+
+selenium_pool = BrowserPool()
+playwright_pool = BrowserPool(per_thread=True)
@@ -18,6 +18,9 @@ from __future__ import annotations
 
 import inspect
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Any, Callable, TYPE_CHECKING
@@ -30,6 +33,7 @@ from werkzeug.wrappers import Response
 from superset import db
 from superset.extensions import cache_manager
 from superset.models.cache import CacheKey
+from superset.utils.decorators import stats_timing
 from superset.utils.hashing import md5_sha_from_dict
 from superset.utils.json import json_int_dttm_ser
 
@@ -89,7 +93,148 @@ ONE_YEAR = 365 * 24 * 60 * 60  # 1 year in seconds
 logger = logging.getLogger(__name__)
 
 
-def memoized_func(key: str, cache: Cache = cache_manager.cache) -> Callable[..., Any]:
+class _Flight:
+    """
+    A computation in progress that concurrent callers for the same key wait on.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _MemoizedState:
+    """
+    Per-function state of ``memoized_func``: the in-process L1 tier, the calls in
+    flight and hit/miss counters.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        self.local_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.shared_calls = 0
+
+    def get_local(self, cache_key: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            self.local_hits += 1
+            return entry[1]
+
+    def set_local(self, cache_key: str, obj: Any, ttl: float, max_size: int) -> None:
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + ttl, obj)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def single_flight(self, cache_key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Run ``compute`` once for all concurrent callers of the same key in this
+        process; the other callers wait for and share its result.
+        """
+        with self._lock:
+            flight = self._flights.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[cache_key] = _Flight()
+            else:
+                self.shared_calls += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except BaseException as ex:
+            flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(cache_key, None)
+            flight.done.set()
+        return flight.result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "local_hits": self.local_hits,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_calls": self.shared_calls,
+                "local_size": len(self._entries),
+            }
+
+
+def _build_key_formatter(
+    key: str,
+    f: Callable[..., Any],
+) -> Callable[[tuple[Any, ...], dict[str, Any]], str]:
+    """
+    Return a function formatting ``key`` with the arguments of a call to ``f``.
+
+    The signature is inspected once. Functions with plain positional/keyword
+    parameters then map arguments with a dict merge instead of ``Signature.bind``,
+    which is only used as a fallback for ``*args``/``**kwargs`` and for calls that
+    do not match the signature (so that the usual ``TypeError`` is raised).
+    """
+    signature = inspect.signature(f)
+    parameters = list(signature.parameters.values())
+    positional = [
+        param.name
+        for param in parameters
+        if param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
+    ]
+    defaults = {
+        param.name: param.default
+        for param in parameters
+        if param.default is not inspect.Parameter.empty
+    }
+    fast = all(
+        param.kind
+        in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        for param in parameters
+    )
+
+    def format_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        if fast and len(args) <= len(positional):
+            arguments = {**defaults, **dict(zip(positional, args)), **kwargs}
+            try:
+                return key.format_map(arguments)
+            except KeyError:
+                pass
+
+        bound_args = signature.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        return key.format(**bound_args.arguments)
+
+    return format_key
+
+
+def memoized_func(
+    key: str,
+    cache: Cache = cache_manager.cache,
+    local: bool = False,
+) -> Callable[..., Any]:
     """
     Decorator with configurable key and cache backend.
 
@@ -112,12 +257,22 @@ def memoized_func(key: str, cache: Cache = cache_manager.cache) -> Callable[...,
     timeout of cache is set to CACHE_DEFAULT_TIMEOUT seconds by default,
     except cache_timeout = {timeout in seconds} is passed to the decorated function.
 
+    Concurrent misses for the same key in a process are computed only once; forced
+    calls always compute.
+
     :param key: a callable function that takes function arguments and returns
                 the caching key.
     :param cache: a FlaskCache instance that will store the cache.
+    :param local: also keep values in an in-process LRU in front of `cache`, for
+                  MEMOIZED_FUNC_LOCAL_TTL seconds (at most the cache timeout).
+                  Values returned from it are shared, so callers must not mutate them.
     """  # noqa: E501
 
     def wrap(f: Callable[..., Any]) -> Callable[..., Any]:
+        format_key = _build_key_formatter(key, f)
+        state = _MemoizedState(f.__qualname__)
+
+        @wraps(f)
         def wrapped_f(*args: Any, **kwargs: Any) -> Any:
             should_cache = kwargs.pop("cache", True)
             force = kwargs.pop("force", False)
@@ -129,18 +284,48 @@ def memoized_func(key: str, cache: Cache = cache_manager.cache) -> Callable[...,
                 return f(*args, **kwargs)
 
             # format the key using args/kwargs passed to the decorated function
-            signature = inspect.signature(f)
-            bound_args = signature.bind(*args, **kwargs)
-            bound_args.apply_defaults()
-            cache_key = key.format(**bound_args.arguments)
-
-            obj = cache.get(cache_key)
-            if not force and obj is not None:
+            cache_key = format_key(args, kwargs)
+
+            local_ttl = 0
+            if local and not isinstance(cache.cache, NullCache):
+                local_ttl = app.config["MEMOIZED_FUNC_LOCAL_TTL"]
+                if cache_timeout:
+                    local_ttl = min(local_ttl, cache_timeout)
+
+            if local_ttl > 0 and not force:
+                obj = state.get_local(cache_key)
+                if obj is not None:
+                    stats_logger.incr(f"memoized_func.{state.name}.local_hit")
+                    return obj
+
+            def compute() -> Any:
+                obj = None if force else cache.get(cache_key)
+                if obj is not None:
+                    state.hits += 1
+                    stats_logger.incr(f"memoized_func.{state.name}.hit")
+                else:
+                    state.misses += 1
+                    stats_logger.incr(f"memoized_func.{state.name}.miss")
+                    with stats_timing(f"memoized_func.{state.name}", stats_logger):
+                        obj = f(*args, **kwargs)
+                    cache.set(cache_key, obj, timeout=cache_timeout)
+
+                if local_ttl > 0 and obj is not None:
+                    state.set_local(
+                        cache_key,
+                        obj,
+                        local_ttl,
+                        app.config["MEMOIZED_FUNC_LOCAL_MAX_SIZE"],
+                    )
                 return obj
-            obj = f(*args, **kwargs)
-            cache.set(cache_key, obj, timeout=cache_timeout)
-            return obj
 
+            if force:
+                # a forced refresh must not join, or be joined by, a regular compute
+                return compute()
+            return state.single_flight(cache_key, compute)
+
+        wrapped_f.get_stats = state.get_stats  # type: ignore[attr-defined]
+        wrapped_f.clear_local = state.clear  # type: ignore[attr-defined]
         return wrapped_f
 
     return wrap
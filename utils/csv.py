@@ -15,13 +15,15 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
+import os
 import re
 import urllib.request
-from typing import Any, Optional, Union
+from typing import Any, Iterator, Optional, Union
 from urllib.error import URLError
 
 import numpy as np
 import pandas as pd
+from flask import current_app
 
 from superset.utils import json
 from superset.utils.core import GenericDataType
@@ -64,7 +66,37 @@ def escape_value(value: str) -> str:
     return value
 
 
-def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
+def escape_column(column: pd.Series) -> pd.Series:
+    """
+    Escapes the strings of a column, see ``escape_value``.
+
+    The regexes run over the whole column at once and only the values that need
+    escaping are replaced; other values (and columns without strings) are returned
+    unchanged.
+    """
+    try:
+        strings = column.str
+    except AttributeError:
+        # not a column of strings
+        return column
+
+    mask = strings.match(problematic_chars_re.pattern, na=False) & ~strings.match(
+        negative_number_re.pattern, na=False
+    )
+    if not mask.any():
+        return column
+
+    mask = mask.to_numpy(dtype=bool)
+    escaped = column.copy()
+    escaped[mask] = ("'" + column[mask].str.replace("|", "\\|", regex=False)).to_numpy()
+    return escaped
+
+
+def escape_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns a copy of the dataframe with its headers and string values escaped.
+    """
+
     def escape_values(v: Any) -> Union[str, Any]:
         return escape_value(v) if isinstance(v, str) else v
 
@@ -72,13 +104,49 @@ def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
     df = df.rename(columns=escape_values)
 
     # Escape csv values
-    for name, column in df.items():
-        if column.dtype == np.dtype(object):
-            for idx, value in enumerate(column.values):
-                if isinstance(value, str):
-                    df.at[idx, name] = escape_value(value)
+    for i, (_, column) in enumerate(df.items()):
+        if column.dtype == np.dtype(object) or isinstance(column.dtype, pd.StringDtype):
+            escaped = escape_column(column)
+            if escaped is not column:
+                df.isetitem(i, escaped)
+
+    return df
+
+
+def iter_escaped_csv(
+    df: pd.DataFrame,
+    chunk_size: Optional[int] = None,
+    **kwargs: Any,
+) -> Iterator[str]:
+    """
+    Escapes and renders the dataframe as CSV, ``chunk_size`` rows at a time, so
+    that only one escaped chunk is held in memory.
 
-    return df.to_csv(escapechar="\\", **kwargs)
+    :param df: The dataframe to render
+    :param chunk_size: Rows per chunk, defaults to ``CSV_EXPORT_CHUNK_SIZE``
+    :param kwargs: Arguments passed to ``DataFrame.to_csv``
+    """
+    chunk_size = chunk_size or current_app.config["CSV_EXPORT_CHUNK_SIZE"]
+    header = kwargs.pop("header", True)
+    for start in range(0, max(len(df), 1), chunk_size):
+        chunk = escape_df(df.iloc[start : start + chunk_size])
+        yield chunk.to_csv(escapechar="\\", header=header, **kwargs)
+        # the header is only written with the first chunk
+        header = False
+
+
+def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
+    path_or_buf = kwargs.pop("path_or_buf", None)
+    if path_or_buf is None:
+        return "".join(iter_escaped_csv(df, **kwargs))
+
+    encoding = kwargs.pop("encoding", None) or "utf-8"
+    if isinstance(path_or_buf, (str, os.PathLike)):
+        with open(path_or_buf, "w", encoding=encoding, newline="") as buffer:
+            buffer.writelines(iter_escaped_csv(df, **kwargs))
+    else:
+        path_or_buf.writelines(iter_escaped_csv(df, **kwargs))
+    return None
 
 
 def get_chart_csv_data(
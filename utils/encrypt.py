@@ -15,13 +15,19 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
+import os
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
+import sqlalchemy as sa
 from flask import Flask
 from flask_babel import lazy_gettext as _
-from sqlalchemy import text, TypeDecorator
-from sqlalchemy.engine import Connection, Dialect, Row
+from sqlalchemy import TypeDecorator
+from sqlalchemy.engine import Dialect, Row
+from sqlalchemy.sql.expression import TableClause
 from sqlalchemy_utils import EncryptedType as SqlaEncryptedType
 
 
@@ -90,12 +96,47 @@ class EncryptedFieldFactory:
 
 
 class SecretsMigrator:
-    def __init__(self, previous_secret_key: str) -> None:
+    """
+    Re-encrypts all encrypted columns from a previous secret key to the current one.
+
+    Tables are read in batches ordered by id, and every batch is re-encrypted and
+    written back with one ``executemany`` in its own transaction. With a
+    ``checkpoint_file`` an interrupted run resumes after the last batch written.
+
+    Values are decrypted with the previous key first, as a wrong key is not always
+    detected. A run started again without a checkpoint therefore decrypts the
+    batches it already wrote with the previous key, and may re-encrypt garbage:
+    always pass a ``checkpoint_file`` to be able to resume runs safely.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        previous_secret_key: str,
+        batch_size: int = 1000,
+        workers: int = 1,
+        checkpoint_file: Optional[str] = None,
+        verify: bool = False,
+    ) -> None:
+        """
+        :param previous_secret_key: The key the values are currently encrypted with
+        :param batch_size: The number of rows re-encrypted per transaction
+        :param workers: The number of tables re-encrypted in parallel, always 1 on
+            SQLite
+        :param checkpoint_file: A JSON file keeping the last id written per table,
+            updated right after each batch is committed
+        :param verify: Decrypt all values with the current key after re-encrypting
+        """
         from superset import db  # pylint: disable=import-outside-toplevel
 
         self._db = db
+        self._engine = db.engine
         self._previous_secret_key = previous_secret_key
         self._dialect: Dialect = db.engine.url.get_dialect()
+        self._batch_size = batch_size
+        self._workers = 1 if self._dialect.name == "sqlite" else workers
+        self._checkpoint_file = checkpoint_file
+        self._checkpoint_lock = threading.Lock()
+        self._verify = verify
 
     def discover_encrypted_fields(self) -> dict[str, dict[str, EncryptedType]]:
         """
@@ -135,38 +176,69 @@ class SecretsMigrator:
         )
 
     @staticmethod
-    def _select_columns_from_table(
-        conn: Connection, column_names: list[str], table_name: str
-    ) -> Row:
-        return conn.execute(f"SELECT id, {','.join(column_names)} FROM {table_name}")  # noqa: S608
+    def _get_table(table_name: str, column_names: list[str]) -> TableClause:
+        # untyped columns, so that values are read and written as stored
+        return sa.table(
+            table_name,
+            sa.column("id"),
+            *(sa.column(column_name) for column_name in column_names),
+        )
+
+    def _iter_batches(
+        self,
+        table_name: str,
+        column_names: list[str],
+        last_id: Any = None,
+    ) -> Iterator[list[Row]]:
+        """
+        Read the encrypted columns of a table in batches ordered by id.
+        """
+        table = self._get_table(table_name, column_names)
+        query = (
+            sa.select(table.c.id, *(table.c[name] for name in column_names))
+            .order_by(table.c.id)
+            .limit(self._batch_size)
+        )
+        while True:
+            batch_query = (
+                query if last_id is None else query.where(table.c.id > last_id)
+            )
+            with self._engine.connect() as conn:
+                rows = conn.execute(batch_query).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1]._mapping["id"]
+            yield rows
 
     def _re_encrypt_row(
         self,
-        conn: Connection,
         row: Row,
         table_name: str,
         columns: dict[str, EncryptedType],
-    ) -> None:
+        previous_types: dict[str, EncryptedType],
+    ) -> Optional[dict[str, Any]]:
         """
         Re encrypts all columns in a Row
         :param row: Current row to reencrypt
         :param columns: Meta info from columns
+        :param previous_types: The types decrypting each column with the previous key
+        :return: The re-encrypted values, or None if the row is already encrypted
+            with the current key
         """
         re_encrypted_columns = {}
+        values = row._mapping
 
         for column_name, encrypted_type in columns.items():
-            previous_encrypted_type = EncryptedType(
-                type_in=encrypted_type.underlying_type, key=self._previous_secret_key
-            )
             try:
-                unencrypted_value = previous_encrypted_type.process_result_value(
-                    self._read_bytes(column_name, row[column_name]), self._dialect
+                unencrypted_value = previous_types[column_name].process_result_value(
+                    self._read_bytes(column_name, values[column_name]), self._dialect
                 )
             except ValueError as ex:
                 # Failed to unencrypt
                 try:
                     encrypted_type.process_result_value(
-                        self._read_bytes(column_name, row[column_name]), self._dialect
+                        self._read_bytes(column_name, values[column_name]),
+                        self._dialect,
                     )
                     logger.info(
                         "Current secret is able to decrypt value on column [%s.%s],"
@@ -174,7 +246,7 @@ class SecretsMigrator:
                         table_name,
                         column_name,
                     )
-                    return
+                    return None
                 except Exception:
                     raise Exception from ex  # pylint: disable=broad-exception-raised
 
@@ -183,25 +255,126 @@ class SecretsMigrator:
                 self._dialect,
             )
 
-        set_cols = ",".join(
-            [f"{name} = :{name}" for name in list(re_encrypted_columns.keys())]
-        )
+        return re_encrypted_columns
+
+    def _re_encrypt_table(
+        self,
+        table_name: str,
+        columns: dict[str, EncryptedType],
+    ) -> None:
         logger.info("Processing table: %s", table_name)
-        conn.execute(
-            text(f"UPDATE {table_name} SET {set_cols} WHERE id = :id"),  # noqa: S608
-            id=row["id"],
-            **re_encrypted_columns,
+        column_names = list(columns.keys())
+        # building the cipher of a type is not free, build one per column
+        previous_types = {
+            column_name: EncryptedType(
+                type_in=encrypted_type.underlying_type, key=self._previous_secret_key
+            )
+            for column_name, encrypted_type in columns.items()
+        }
+        table = self._get_table(table_name, column_names)
+        update = (
+            sa.update(table)
+            .where(table.c.id == sa.bindparam("_id"))
+            .values({name: sa.bindparam(f"_{name}") for name in column_names})
         )
 
+        processed = 0
+        last_id = self._load_checkpoint(table_name)
+        for rows in self._iter_batches(table_name, column_names, last_id):
+            params = []
+            for row in rows:
+                values = self._re_encrypt_row(row, table_name, columns, previous_types)
+                if values is not None:
+                    params.append(
+                        {
+                            "_id": row._mapping["id"],
+                            **{f"_{name}": value for name, value in values.items()},
+                        }
+                    )
+            if params:
+                with self._engine.begin() as conn:
+                    conn.execute(update, params)
+            processed += len(params)
+            self._save_checkpoint(table_name, rows[-1]._mapping["id"])
+        logger.info("Re-encrypted %i rows of table %s", processed, table_name)
+
+    def _load_checkpoint(self, table_name: str) -> Any:
+        if not self._checkpoint_file or not os.path.exists(self._checkpoint_file):
+            return None
+        # pylint: disable=import-outside-toplevel
+        from superset.utils import json
+
+        with self._checkpoint_lock, open(self._checkpoint_file) as file:
+            last_id = json.loads(file.read()).get(table_name)
+        if last_id is not None:
+            logger.info("Resuming table %s after id %s", table_name, last_id)
+        return last_id
+
+    def _save_checkpoint(self, table_name: str, last_id: Any) -> None:
+        if not self._checkpoint_file:
+            return
+        # pylint: disable=import-outside-toplevel
+        from superset.utils import json
+
+        with self._checkpoint_lock:
+            checkpoints = {}
+            if os.path.exists(self._checkpoint_file):
+                with open(self._checkpoint_file) as file:
+                    checkpoints = json.loads(file.read())
+            checkpoints[table_name] = last_id
+            with open(self._checkpoint_file, "w") as file:
+                file.write(json.dumps(checkpoints))
+
+    def verify(self) -> int:
+        """
+        Decrypt every encrypted value with the current key.
+
+        :return: The number of values that cannot be decrypted, each one is logged
+        """
+        failures = 0
+        for table_name, columns in self.discover_encrypted_fields().items():
+            for rows in self._iter_batches(table_name, list(columns.keys())):
+                for row in rows:
+                    for column_name, encrypted_type in columns.items():
+                        try:
+                            encrypted_type.process_result_value(
+                                self._read_bytes(
+                                    column_name, row._mapping[column_name]
+                                ),
+                                self._dialect,
+                            )
+                        except Exception:  # pylint: disable=broad-except
+                            failures += 1
+                            logger.error(
+                                "Cannot decrypt column [%s.%s] of id %s",
+                                table_name,
+                                column_name,
+                                row._mapping["id"],
+                            )
+        logger.info("Verified all tables, %i values cannot be decrypted", failures)
+        return failures
+
     def run(self) -> None:
         encrypted_meta_info = self.discover_encrypted_fields()
 
-        with self._db.engine.begin() as conn:
-            logger.info("Collecting info for re encryption")
+        logger.info("Collecting info for re encryption")
+        if self._workers > 1:
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                futures = [
+                    executor.submit(self._re_encrypt_table, table_name, columns)
+                    for table_name, columns in encrypted_meta_info.items()
+                ]
+                for future in futures:
+                    future.result()
+        else:
             for table_name, columns in encrypted_meta_info.items():
-                column_names = list(columns.keys())
-                rows = self._select_columns_from_table(conn, column_names, table_name)
-
-                for row in rows:
-                    self._re_encrypt_row(conn, row, table_name, columns)
+                self._re_encrypt_table(table_name, columns)
         logger.info("All tables processed")
+
+        if self._checkpoint_file and os.path.exists(self._checkpoint_file):
+            os.remove(self._checkpoint_file)
+
+        if self._verify and (failures := self.verify()):
+            raise Exception(  # pylint: disable=broad-exception-raised
+                f"{failures} values cannot be decrypted with the current secret key"
+            )
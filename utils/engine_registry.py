@@ -0,0 +1,383 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Process-wide registry of SQLAlchemy engines for analytics databases.
+
+Creating an engine for every ``Database.get_sqla_engine`` call means every chart
+query pays for engine construction and a fresh connection handshake. When
+``DB_ENGINE_POOL_ENABLED`` is set, engines are instead kept here, keyed on
+everything that can change the resulting connection, so that their connection pools
+are reused across requests.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, TYPE_CHECKING
+
+from flask import current_app
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import URL
+from sqlalchemy.util import get_cls_kwargs
+
+from superset.utils.hashing import md5_sha_from_dict
+
+if TYPE_CHECKING:
+    from sshtunnel import SSHTunnelForwarder
+
+    from superset.databases.ssh_tunnel.models import SSHTunnel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EngineKey:
+    """
+    Identifies a pooled engine.
+
+    ``params_hash`` covers the final URL (including credentials and any access
+    token) and the engine kwargs, so a changed password, OAuth2 token or engine
+    parameter never reuses an engine built for the old values.
+    """
+
+    database_id: int | None
+    catalog: str | None
+    schema: str | None
+    effective_username: str | None
+    source: str | None
+    params_hash: str
+
+
+@dataclass
+class _EngineEntry:
+    engine: Engine
+    last_used: float
+
+
+@dataclass
+class _TunnelEntry:
+    tunnel: SSHTunnelForwarder
+    last_used: float
+
+
+class EngineRegistry:
+    """
+    Thread-safe LRU of engines (and the SSH tunnels they connect through).
+
+    Engines idle for longer than ``DB_ENGINE_IDLE_TIMEOUT`` seconds with no
+    connections checked out are disposed, as are the least recently used engines
+    once ``DB_ENGINE_REGISTRY_MAX_SIZE`` is exceeded.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._engines: OrderedDict[EngineKey, _EngineEntry] = OrderedDict()
+        self._tunnels: dict[tuple[int | None, str], _TunnelEntry] = {}
+        self._last_eviction = time.monotonic()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # pooled connections must never be shared with a forked child process
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # drop the pooled connections inherited from the parent process without
+        # closing them, the parent still uses their sockets
+        for entry in self._engines.values():
+            try:
+                entry.engine.dispose(close=False)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Failed to dispose inherited engine", exc_info=True)
+        self._lock = threading.RLock()
+        self._engines = OrderedDict()
+        self._tunnels = {}
+
+    @staticmethod
+    def build_key(  # pylint: disable=too-many-arguments
+        database_id: int | None,
+        catalog: str | None,
+        schema: str | None,
+        effective_username: str | None,
+        source: Any,
+        url: URL,
+        engine_kwargs: dict[str, Any],
+    ) -> EngineKey:
+        params_hash = md5_sha_from_dict(
+            {
+                "url": url.render_as_string(hide_password=False),
+                "engine_kwargs": engine_kwargs,
+            },
+            default=repr,
+        )
+        return EngineKey(
+            database_id=database_id,
+            catalog=catalog,
+            schema=schema,
+            effective_username=effective_username,
+            source=str(source) if source is not None else None,
+            params_hash=params_hash,
+        )
+
+    def get_engine(
+        self,
+        key: EngineKey,
+        url: URL,
+        engine_kwargs: dict[str, Any],
+    ) -> Engine:
+        """
+        Return the pooled engine for ``key``, creating it if needed.
+
+        Pool sizing from ``DB_ENGINE_POOL_PARAMS`` only applies where the database
+        ``engine_params`` do not already set it, so limits can be tuned per database.
+        """
+        self._evict_idle()
+        with self._lock:
+            if entry := self._engines.get(key):
+                entry.last_used = time.monotonic()
+                self._engines.move_to_end(key)
+                self._hits += 1
+                return entry.engine
+            self._misses += 1
+
+        # creating an engine may import the dialect, do not block other lookups
+        engine_kwargs = {
+            **self._get_pool_params(url, engine_kwargs),
+            **engine_kwargs,
+        }
+        engine = create_engine(url, **engine_kwargs)
+
+        with self._lock:
+            if entry := self._engines.get(key):
+                # another thread created the engine in the meantime, use that one
+                entry.last_used = time.monotonic()
+                self._engines.move_to_end(key)
+                stale, engine = engine, entry.engine
+            else:
+                self._engines[key] = _EngineEntry(engine, time.monotonic())
+                stale = None
+
+            max_size = current_app.config["DB_ENGINE_REGISTRY_MAX_SIZE"]
+            while len(self._engines) > max_size:
+                _, evicted = self._engines.popitem(last=False)
+                self._dispose(evicted.engine)
+
+        if stale is not None:
+            # never connected, disposing it is cheap
+            stale.dispose()
+        return engine
+
+    @staticmethod
+    def _get_pool_params(url: URL, engine_kwargs: dict[str, Any]) -> dict[str, Any]:
+        """
+        The ``DB_ENGINE_POOL_PARAMS`` accepted by the pool class of an engine.
+
+        ``create_engine`` rejects the parameters its pool does not take, e.g. the
+        sizing of a ``NullPool``, the default for SQLite files.
+        """
+        if "pool" in engine_kwargs:
+            return {}
+        pool_class = engine_kwargs.get("poolclass")
+        if pool_class is None:
+            pool_class = url.get_dialect().get_pool_class(url)
+        accepted = get_cls_kwargs(pool_class)
+        return {
+            name: value
+            for name, value in current_app.config["DB_ENGINE_POOL_PARAMS"].items()
+            if name in accepted or name.removeprefix("pool_") in accepted
+        }
+
+    def get_tunnel(
+        self,
+        database_id: int | None,
+        ssh_tunnel: SSHTunnel,
+        sqlalchemy_uri: str,
+    ) -> SSHTunnelForwarder:
+        """
+        Return a long-lived, started SSH tunnel for a database.
+
+        Pooled connections outlive a single ``get_sqla_engine`` call, so the tunnel
+        they go through has to as well. The tunnel is keyed on its own settings and the
+        target URI; a changed tunnel gets a new local port and therefore new engines.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import ssh_manager_factory
+
+        tunnel_hash = md5_sha_from_dict(
+            {
+                "uri": sqlalchemy_uri,
+                "server_address": ssh_tunnel.server_address,
+                "server_port": ssh_tunnel.server_port,
+                "username": ssh_tunnel.username,
+                "password": ssh_tunnel.password,
+                "private_key": ssh_tunnel.private_key,
+                "private_key_password": ssh_tunnel.private_key_password,
+            }
+        )
+        key = (database_id, tunnel_hash)
+        with self._lock:
+            entry = self._tunnels.get(key)
+            if entry and entry.tunnel.is_active:
+                entry.last_used = time.monotonic()
+                return entry.tunnel
+
+        # starting a tunnel connects to the SSH server, do not block other lookups
+        tunnel = ssh_manager_factory.instance.create_tunnel(
+            ssh_tunnel=ssh_tunnel,
+            sqlalchemy_database_uri=sqlalchemy_uri,
+        )
+        tunnel.start()
+
+        with self._lock:
+            entry = self._tunnels.get(key)
+            if entry and entry.tunnel.is_active:
+                # another thread started a tunnel in the meantime, use that one
+                entry.last_used = time.monotonic()
+                stale, tunnel = tunnel, entry.tunnel
+            else:
+                self._tunnels[key] = _TunnelEntry(tunnel, time.monotonic())
+                stale = entry.tunnel if entry else None
+
+        if stale is not None:
+            self._stop(stale)
+        return tunnel
+
+    def invalidate(self, database_id: int | None) -> None:
+        """
+        Dispose all engines and stop all tunnels of a database.
+        """
+        with self._lock:
+            for key in [key for key in self._engines if key.database_id == database_id]:
+                self._dispose(self._engines.pop(key).engine)
+            for key in [key for key in self._tunnels if key[0] == database_id]:
+                self._stop(self._tunnels.pop(key).tunnel)
+
+    def clear(self) -> None:
+        with self._lock:
+            while self._engines:
+                _, entry = self._engines.popitem()
+                self._dispose(entry.engine)
+            while self._tunnels:
+                _, tunnel_entry = self._tunnels.popitem()
+                self._stop(tunnel_entry.tunnel)
+
+    def get_stats(self, database_id: int | None = None) -> dict[str, Any]:
+        """
+        Return registry counters and per-engine pool statistics.
+
+        :param database_id: only report engines of this database
+        """
+        now = time.monotonic()
+        with self._lock:
+            engines = [
+                {
+                    "catalog": key.catalog,
+                    "schema": key.schema,
+                    "effective_username": key.effective_username,
+                    "source": key.source,
+                    "idle_seconds": round(now - entry.last_used, 3),
+                    **self._pool_stats(entry.engine),
+                }
+                for key, entry in self._engines.items()
+                if database_id is None or key.database_id == database_id
+            ]
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "tunnels": sum(
+                    1
+                    for key in self._tunnels
+                    if database_id is None or key[0] == database_id
+                ),
+                "engines": engines,
+            }
+
+    @staticmethod
+    def _pool_stats(engine: Engine) -> dict[str, Any]:
+        pool = engine.pool
+        stats: dict[str, Any] = {"pool": type(pool).__name__}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if method := getattr(pool, name, None):
+                stats[name] = method()
+        return stats
+
+    def _evict_idle(self) -> None:
+        idle_timeout = current_app.config["DB_ENGINE_IDLE_TIMEOUT"]
+        now = time.monotonic()
+        # only sweep a few times per timeout window, not on every call
+        if now - self._last_eviction < idle_timeout / 4:
+            return
+
+        with self._lock:
+            self._last_eviction = now
+            for key, entry in list(self._engines.items()):
+                checkedout = getattr(entry.engine.pool, "checkedout", lambda: 0)()
+                if now - entry.last_used > idle_timeout and not checkedout:
+                    self._dispose(self._engines.pop(key).engine)
+
+            active_databases = {key.database_id for key in self._engines}
+            for tunnel_key, tunnel_entry in list(self._tunnels.items()):
+                if (
+                    tunnel_key[0] not in active_databases
+                    and now - tunnel_entry.last_used > idle_timeout
+                ):
+                    self._stop(self._tunnels.pop(tunnel_key).tunnel)
+
+    def _dispose(self, engine: Engine) -> None:
+        self._evictions += 1
+        try:
+            engine.dispose()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to dispose engine", exc_info=True)
+
+    @staticmethod
+    def _stop(tunnel: SSHTunnelForwarder) -> None:
+        try:
+            tunnel.stop()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to stop SSH tunnel", exc_info=True)
+
+
+engine_registry = EngineRegistry()
+
+
+def invalidate_database_engines(  # pylint: disable=unused-argument
+    mapper: Any,
+    connection: Any,
+    target: Any,
+) -> None:
+    """
+    SQLAlchemy event handler for ``Database`` changes.
+    """
+    engine_registry.invalidate(target.id)
+
+
+def invalidate_ssh_tunnel_engines(  # pylint: disable=unused-argument
+    mapper: Any,
+    connection: Any,
+    target: Any,
+) -> None:
+    """
+    SQLAlchemy event handler for ``SSHTunnel`` changes.
+    """
+    engine_registry.invalidate(target.database_id)
@@ -18,6 +18,7 @@ import io
 from typing import Any
 
 import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
 
 from superset.utils.core import GenericDataType
 
@@ -26,16 +27,20 @@ def quote_formulas(df: pd.DataFrame) -> pd.DataFrame:
     """
     Make sure to quote any formulas for security reasons.
     """
-    formula_prefixes = {"=", "+", "-", "@"}
+    formula_prefixes = ["=", "+", "-", "@"]
 
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].apply(
-            lambda x: (
-                f"'{x}"
-                if isinstance(x, str) and len(x) and x[0] in formula_prefixes
-                else x
-            )
-        )
+    for i, (_, column) in enumerate(df.items()):
+        if column.dtype != object and not isinstance(column.dtype, pd.StringDtype):
+            continue
+        try:
+            mask = column.str[:1].isin(formula_prefixes).to_numpy(dtype=bool)
+        except AttributeError:
+            # not a column of strings
+            continue
+        if mask.any():
+            quoted = column.copy()
+            quoted[mask] = ("'" + column[mask]).to_numpy()
+            df.isetitem(i, quoted)
 
     return df
 
@@ -66,14 +71,15 @@ def apply_column_types(
     for column, column_type in zip(df.columns, column_types, strict=False):
         if column_type == GenericDataType.NUMERIC:
             try:
-                df[column] = pd.to_numeric(df[column])
+                df[column] = values = pd.to_numeric(df[column])
                 # if the number is too large, convert it to a string
                 # Excel does not support numbers larger than 10^15
-                df[column] = df[column].apply(
-                    lambda x: str(x)
-                    if isinstance(x, (int, float)) and abs(x) > 10**15
-                    else x
-                )
+                if is_numeric_dtype(values) and not is_bool_dtype(values):
+                    mask = (values.abs() > 10**15).to_numpy(dtype=bool, na_value=False)
+                    if mask.any():
+                        values = values.astype(object)
+                        values[mask] = [str(x) for x in values[mask]]
+                        df[column] = values
             except ValueError:
                 df[column] = df[column].astype(str)
         elif pd.api.types.is_datetime64tz_dtype(df[column]):
@@ -0,0 +1,169 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Streaming CSV and XLSX exports.
+
+Both writers take an iterable of DataFrame or Arrow batches, e.g. from
+``Database.iter_arrow_batches``, and yield encoded bytes, so that a web response or
+a report attachment can be streamed with memory bounded by the batch size rather
+than by the number of rows.
+"""
+
+from __future__ import annotations
+
+import codecs
+import tempfile
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Union
+
+import pandas as pd
+import pyarrow as pa
+import xlsxwriter
+
+from superset.result_set import SupersetResultSet
+from superset.utils.core import GenericDataType
+from superset.utils.csv import iter_escaped_csv
+from superset.utils.excel import apply_column_types, quote_formulas
+
+ExportBatch = Union[pd.DataFrame, pa.Table, pa.RecordBatch]
+
+# Excel limits
+XLSX_MAX_ROWS = 1_048_576
+XLSX_MAX_SHEET_NAME_LENGTH = 31
+
+# size of the reads when yielding the finished XLSX file
+XLSX_READ_SIZE = 64 * 1024
+
+XLSX_CELL_TYPES = (str, int, float, Decimal, datetime, date, time, timedelta)
+
+
+def iter_dataframes(batches: Iterable[ExportBatch]) -> Iterator[pd.DataFrame]:
+    """
+    Convert each batch to a DataFrame, converting Arrow batches like query results.
+    """
+    for batch in batches:
+        if isinstance(batch, pa.RecordBatch):
+            batch = pa.Table.from_batches([batch])
+        if isinstance(batch, pa.Table):
+            batch = SupersetResultSet.convert_table_to_df(batch)
+        yield batch
+
+
+def iter_csv_bytes(
+    batches: Iterable[ExportBatch],
+    encoding: str = "utf-8",
+    **kwargs: Any,
+) -> Iterator[bytes]:
+    """
+    Render batches as one escaped CSV file, yielding encoded chunks.
+
+    :param batches: DataFrames or Arrow batches with the same columns
+    :param encoding: The output encoding; a BOM (as in ``utf-8-sig``) is only
+        written once
+    :param kwargs: Arguments passed to ``DataFrame.to_csv``, e.g. ``CSV_EXPORT``
+    """
+    encoder = codecs.getincrementalencoder(encoding)()
+    header = kwargs.pop("header", True)
+    for df in iter_dataframes(batches):
+        for chunk in iter_escaped_csv(df, header=header, **kwargs):
+            header = False
+            yield encoder.encode(chunk)
+    if tail := encoder.encode("", final=True):
+        yield tail
+
+
+def _to_cell(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, *XLSX_CELL_TYPES)):
+        return value
+    return str(value)
+
+
+def _add_worksheet(
+    workbook: xlsxwriter.Workbook,
+    sheet_name: str,
+    number: int,
+    header: list[str],
+) -> tuple[Any, int]:
+    suffix = f" ({number})" if number > 1 else ""
+    name = sheet_name[: XLSX_MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix
+    worksheet = workbook.add_worksheet(name)
+    if not header:
+        return worksheet, 0
+    worksheet.write_row(0, 0, header)
+    return worksheet, 1
+
+
+def iter_xlsx_bytes(
+    batches: Iterable[ExportBatch],
+    sheet_name: str = "Sheet1",
+    column_types: list[GenericDataType] | None = None,
+) -> Iterator[bytes]:
+    """
+    Render batches as one XLSX file, yielding its bytes.
+
+    Rows are written with xlsxwriter's ``constant_memory`` mode, which flushes each
+    row to a temporary file, and the workbook itself is written to a temporary file,
+    so memory stays bounded by the batch size. An XLSX file is a zip archive that
+    is only complete once the last row is written, so the bytes are yielded after
+    that. Rows beyond the Excel limit go to additional sheets.
+
+    :param batches: DataFrames or Arrow batches with the same columns
+    :param sheet_name: The name of the first sheet
+    :param column_types: The types of the columns, see ``apply_column_types``
+    """
+    with tempfile.TemporaryFile() as output:
+        workbook = xlsxwriter.Workbook(
+            output,
+            {
+                "constant_memory": True,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+                "remove_timezone": True,
+                "nan_inf_to_errors": True,
+                "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            },
+        )
+        sheets = 0
+        row_idx = XLSX_MAX_ROWS
+        for df in iter_dataframes(batches):
+            if column_types:
+                df = apply_column_types(df, column_types)
+            # make sure formulas are quoted, to prevent malicious injections
+            df = quote_formulas(df)
+            df = df.astype(object).where(df.notna(), None)
+            header = [str(col) for col in df.columns]
+            if not sheets:
+                worksheet, row_idx = _add_worksheet(workbook, sheet_name, 1, header)
+                sheets = 1
+
+            for row in df.itertuples(index=False, name=None):
+                if row_idx == XLSX_MAX_ROWS:
+                    sheets += 1
+                    worksheet, row_idx = _add_worksheet(
+                        workbook, sheet_name, sheets, header
+                    )
+                worksheet.write_row(row_idx, 0, [_to_cell(value) for value in row])
+                row_idx += 1
+
+        if not sheets:
+            _add_worksheet(workbook, sheet_name, 1, [])
+        workbook.close()
+
+        output.seek(0)
+        while data := output.read(XLSX_READ_SIZE):
+            yield data
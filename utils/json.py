@@ -19,7 +19,8 @@ import decimal
 import logging
 import uuid
 from datetime import date, datetime, time, timedelta
-from typing import Any, Callable, Dict, Optional, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -168,6 +169,37 @@ def json_dumps_w_dates(payload: dict[Any, Any], sort_keys: bool = False) -> str:
     return dumps(payload, default=json_int_dttm_ser, sort_keys=sort_keys)
 
 
+@lru_cache(maxsize=2)
+def _get_dates_encoder(sort_keys: bool) -> simplejson.JSONEncoder:
+    return simplejson.JSONEncoder(
+        default=json_int_dttm_ser,
+        allow_nan=False,
+        ignore_nan=True,
+        sort_keys=sort_keys,
+    )
+
+
+def json_dumps_w_dates_many(
+    payloads: Iterable[Any],
+    sort_keys: bool = False,
+) -> list[str]:
+    """
+    Bulk version of ``json_dumps_w_dates``.
+
+    A single encoder is reused for every payload instead of being rebuilt per call,
+    which is what dominates when serializing every cell of a column. The output is
+    identical to calling ``json_dumps_w_dates`` on each payload.
+    """
+    encode = _get_dates_encoder(sort_keys).encode
+    results = []
+    for payload in payloads:
+        try:
+            results.append(encode(payload))
+        except UnicodeDecodeError:
+            results.append(json_dumps_w_dates(payload, sort_keys=sort_keys))
+    return results
+
+
 def validate_json(obj: Union[bytes, bytearray, str]) -> None:
     """
     A JSON Validator that validates an object of bytes, bytes array or string
@@ -14,17 +14,21 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-from typing import Any, Callable, Optional, Union
+from typing import Any, Optional, Union
 
 import numpy as np
 from flask_babel import gettext as _
 from pandas import DataFrame, Series, to_numeric
+from pandas.api.types import is_extension_array_dtype
 
 from superset.exceptions import InvalidPostProcessingError
 from superset.utils.core import PostProcessingBoxplotWhiskerType
-from superset.utils.pandas_postprocessing.aggregate import aggregate
+from superset.utils.pandas_postprocessing.utils import validate_column_args
 
+BOXPLOT_OPERATORS = ("mean", "median", "max", "min", "q1", "q3", "count", "outliers")
 
+
+@validate_column_args("groupby")
 def boxplot(  # noqa: C901
     df: DataFrame,
     groupby: list[str],
@@ -49,34 +53,17 @@ def boxplot(  # noqa: C901
     - `__outliers`: the values that fall outside the minimum/maximum value
                     (see whisker type)
 
+    The statistics are computed with grouped operations over all groups at once:
+    the quartiles of a metric are computed once and shared by the Tukey whiskers,
+    and the outliers are selected with a mask over all rows.
+
     :param df: DataFrame containing all-numeric data (temporal column ignored)
     :param groupby: The categories to group by (x-axis)
     :param metrics: The metrics for which to calculate the distribution
     :param whisker_type: The confidence level type
     :return: DataFrame with boxplot statistics per groupby
     """
-
-    def quartile1(series: Series) -> float:
-        return np.nanpercentile(series, 25, method="midpoint")
-
-    def quartile3(series: Series) -> float:
-        return np.nanpercentile(series, 75, method="midpoint")
-
-    if whisker_type == PostProcessingBoxplotWhiskerType.TUKEY:
-
-        def whisker_high(series: Series) -> float:
-            upper_outer_lim = quartile3(series) + 1.5 * (
-                quartile3(series) - quartile1(series)
-            )
-            return series[series <= upper_outer_lim].max()
-
-        def whisker_low(series: Series) -> float:
-            lower_outer_lim = quartile1(series) - 1.5 * (
-                quartile3(series) - quartile1(series)
-            )
-            return series[series >= lower_outer_lim].min()
-
-    elif whisker_type == PostProcessingBoxplotWhiskerType.PERCENTILE:
+    if whisker_type == PostProcessingBoxplotWhiskerType.PERCENTILE:
         if (
             not isinstance(percentiles, (list, tuple))
             or len(percentiles) != 2
@@ -90,43 +77,134 @@ def boxplot(  # noqa: C901
                     "of which the first is lower than the second value"
                 )
             )
-        low, high = percentiles[0], percentiles[1]
 
-        def whisker_high(series: Series) -> float:
-            return np.nanpercentile(series, high)
-
-        def whisker_low(series: Series) -> float:
-            return np.nanpercentile(series, low)
+    for column in metrics:
+        if column not in df:
+            raise InvalidPostProcessingError(
+                _(
+                    "Column referenced by aggregate is undefined: %(column)s",
+                    column=column,
+                )
+            )
+        # quantiles need numeric values
+        if df.dtypes[column] == np.object_:
+            df[column] = to_numeric(df[column], errors="coerce")
 
-    else:
-        whisker_high = np.max
-        whisker_low = np.min
+    df_groupby = df.groupby(by=groupby) if groupby else df.groupby(lambda _: True)
+    counts = df_groupby.size()
+    # the group of each row, rows with null groupby values are in no group
+    group_codes = df_groupby.ngroup()
+    in_group = group_codes.notna().to_numpy()
+    codes = group_codes.to_numpy()[in_group].astype(np.intp)
+
+    statistics: dict[str, Series] = {}
+    for metric in metrics:
+        values = df[metric]
+        if is_extension_array_dtype(values.dtype):
+            values = values.astype("float64")
+        metric_statistics = _boxplot_statistics(
+            df_groupby[metric],
+            values.to_numpy()[in_group],
+            codes,
+            whisker_type,
+            percentiles,
+        )
+        metric_statistics["count"] = counts
+        for operator_name, statistic in metric_statistics.items():
+            statistics[f"{metric}__{operator_name}"] = statistic.set_axis(counts.index)
+
+    result = DataFrame(
+        {
+            f"{metric}__{operator_name}": statistics[f"{metric}__{operator_name}"]
+            for operator_name in BOXPLOT_OPERATORS
+            for metric in metrics
+        },
+        index=counts.index,
+    )
+    return result.reset_index(drop=not groupby)
+
+
+def _boxplot_statistics(
+    column: Any,
+    values: np.ndarray,
+    codes: np.ndarray,
+    whisker_type: PostProcessingBoxplotWhiskerType,
+    percentiles: Any,
+) -> dict[str, Series]:
+    """
+    Compute the boxplot statistics of a metric for all groups.
 
-    def outliers(series: Series) -> set[float]:
-        above = series[series > whisker_high(series)]
-        below = series[series < whisker_low(series)]
-        return above.tolist() + below.tolist()
+    :param column: The grouped metric
+    :param values: The values of the metric of the rows in a group
+    :param codes: The group of each of ``values``
+    """
+    q1, q3 = _grouped_quantiles(column, 0.25, 0.75, interpolation="midpoint")
 
-    operators: dict[str, Callable[[Any], Any]] = {
-        "mean": np.mean,
-        "median": np.median,
+    if whisker_type == PostProcessingBoxplotWhiskerType.TUKEY:
+        # Tukey's fences, the whiskers are the most extreme values within them
+        iqr = q3 - q1
+        upper_fence = (q3 + 1.5 * iqr).to_numpy()[codes]
+        lower_fence = (q1 - 1.5 * iqr).to_numpy()[codes]
+        whisker_high = _grouped_extreme(values, codes, values <= upper_fence, len(q1))
+        whisker_low = _grouped_extreme(
+            values, codes, values >= lower_fence, len(q1), low=True
+        )
+    elif whisker_type == PostProcessingBoxplotWhiskerType.PERCENTILE:
+        low, high = percentiles[0], percentiles[1]
+        whisker_low, whisker_high = _grouped_quantiles(column, low / 100, high / 100)
+    else:
+        whisker_high = column.max()
+        whisker_low = column.min()
+
+    # the values above the high whisker, then the ones below the low whisker, each
+    # in the order of the rows
+    above = values > whisker_high.to_numpy()[codes]
+    below = values < whisker_low.to_numpy()[codes]
+    is_outlier = above | below
+    outlier_codes = codes[is_outlier]
+    order = np.lexsort((below[is_outlier], outlier_codes))
+    outlier_values = values[is_outlier][order].tolist()
+    bounds = np.searchsorted(outlier_codes[order], np.arange(len(q1) + 1))
+    outliers = Series(
+        [outlier_values[start:end] for start, end in zip(bounds[:-1], bounds[1:])],
+        dtype=object,
+    )
+
+    return {
+        "mean": column.mean(),
+        "median": column.median(),
         "max": whisker_high,
         "min": whisker_low,
-        "q1": quartile1,
-        "q3": quartile3,
-        "count": np.ma.count,
+        "q1": q1,
+        "q3": q3,
         "outliers": outliers,
     }
-    aggregates: dict[str, dict[str, Union[str, Callable[..., Any]]]] = {
-        f"{metric}__{operator_name}": {"column": metric, "operator": operator}
-        for operator_name, operator in operators.items()
-        for metric in metrics
-    }
 
-    # nanpercentile needs numeric values, otherwise the isnan function
-    # that's used in the underlying function will fail
-    for column in metrics:
-        if df.dtypes[column] == np.object_:
-            df[column] = to_numeric(df[column], errors="coerce")
 
-    return aggregate(df, groupby=groupby, aggregates=aggregates)
+def _grouped_quantiles(
+    column: Any,
+    low: float,
+    high: float,
+    **kwargs: Any,
+) -> tuple[Series, Series]:
+    """
+    The low and high quantiles of each group, computed in one pass.
+    """
+    quantiles = column.quantile([low, high], **kwargs).unstack()
+    quantiles = quantiles.reindex(columns=[low, high])
+    return quantiles[low], quantiles[high]
+
+
+def _grouped_extreme(
+    values: np.ndarray,
+    codes: np.ndarray,
+    mask: np.ndarray,
+    groups: int,
+    low: bool = False,
+) -> Series:
+    """
+    The maximum (or minimum) of the masked values of each group.
+    """
+    grouped = Series(values[mask]).groupby(codes[mask])
+    extreme = grouped.min() if low else grouped.max()
+    return extreme.reindex(range(groups))
@@ -20,8 +20,9 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Any
 
+import numpy as np
 from flask_babel import gettext as _
-from pandas import DataFrame, MultiIndex
+from pandas import DataFrame, isna, MultiIndex, Series
 
 from superset.exceptions import InvalidPostProcessingError
 from superset.utils.core import PostProcessingContributionOrientation
@@ -54,14 +55,15 @@ def contribution(
     :param orientation: calculate by dividing cell with row/column total
     :return: DataFrame with contributions.
     """
-    contribution_df = df.copy()
-    numeric_df = contribution_df.select_dtypes(include=["number", Decimal])
-    numeric_df.fillna(0, inplace=True)
+    # the contributions are added as new columns, the other columns are shared
+    contribution_df = df.copy(deep=False)
+    # select the numeric columns on an empty frame, as selecting copies the data
+    numeric_columns = df.iloc[:0].select_dtypes(include=["number", Decimal]).columns
     # verify column selections
     if columns:
-        numeric_columns = numeric_df.columns.tolist()
+        numeric_columns_list = numeric_columns.tolist()
         for col in columns:
-            if col not in numeric_columns:
+            if col not in numeric_columns_list:
                 raise InvalidPostProcessingError(
                     _(
                         'Column "%(column)s" is not numeric or does not '
@@ -69,7 +71,7 @@ def contribution(
                         column=col,
                     )
                 )
-    actual_columns = columns or numeric_df.columns
+    actual_columns = columns or numeric_columns
 
     rename_columns = rename_columns or actual_columns
     if len(rename_columns) != len(actual_columns):
@@ -78,25 +80,35 @@ def contribution(
                 "`rename_columns` must have the same length as `columns` + `time_shift_columns`."  # noqa: E501
             )
         )
-    # limit to selected columns
-    numeric_df_view = numeric_df[actual_columns]
-
+    # work column by column on views of the selected columns, rather than on a
+    # copy of the frame, and add each contribution column as soon as it is computed
     if orientation == PostProcessingContributionOrientation.COLUMN:
-        numeric_df_view = numeric_df_view / numeric_df_view.values.sum(
-            axis=0, keepdims=True
-        )
-        contribution_df[rename_columns] = numeric_df_view
+        for column, rename_column in zip(actual_columns, rename_columns, strict=False):
+            values = _get_values(df[column])
+            filled_values = np.where(isna(values), 0, values)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                contribution_df[rename_column] = filled_values / filled_values.sum()
         return contribution_df
 
-    result = get_column_groups(numeric_df_view, time_shifts, rename_columns)
     calculate_row_contribution(
-        contribution_df, result["non_time_shift"][0], result["non_time_shift"][1]
+        df,
+        contribution_df,
+        get_column_groups(df.iloc[:0][actual_columns], time_shifts, rename_columns),
     )
-    for time_shift in result["time_shifts"].items():
-        calculate_row_contribution(contribution_df, time_shift[1][0], time_shift[1][1])
     return contribution_df
 
 
+def _get_values(series: Series, as_float: bool = False) -> np.ndarray:
+    """
+    The values of a numeric column, a view for float columns.
+
+    Object (e.g. `Decimal`) columns keep their values unless `as_float` is set.
+    """
+    if series.dtype == np.object_ and not as_float:
+        return series.to_numpy()
+    return series.to_numpy(dtype=float, na_value=np.nan)
+
+
 def get_column_groups(
     df: DataFrame, time_shifts: list[str] | None, rename_columns: list[str]
 ) -> dict[str, Any]:
@@ -135,20 +147,46 @@ def get_column_groups(
 
 
 def calculate_row_contribution(
-    df: DataFrame, columns: list[str], rename_columns: list[str]
+    df: DataFrame, contribution_df: DataFrame, column_groups: dict[str, Any]
 ) -> None:
     """
-    Calculate the contribution of each column to the row total and update the DataFrame.
+    Calculate the contribution of each column to the row total of its group and add
+    it to `contribution_df`.
 
-    This function calculates the contribution of each selected column to the total of the row,
-    and updates the DataFrame with these contribution percentages in place of the original values.
+    Columns with the same time shift, and the columns without one, form a group. The
+    row totals of all groups are accumulated into one (row, group) matrix in a single
+    pass over the columns, nulls counting as zero.
 
     :param df: The DataFrame to calculate contributions for.
-    :param columns: A list of column names to calculate contributions for.
-    :param rename_columns: A list of new column names for the contribution columns.
-    """  # noqa: E501
-    # calculate the row sum considering only the selected columns
-    row_sum_except_selected = df.loc[:, columns].sum(axis=1)
-
-    # update the dataframe cells with the row contribution percentage
-    df[rename_columns] = df.loc[:, columns].div(row_sum_except_selected, axis=0)
+    :param contribution_df: The DataFrame to add the contribution columns to.
+    :param column_groups: The original and renamed columns of each group, see
+        `get_column_groups`.
+    """
+    groups = [column_groups["non_time_shift"], *column_groups["time_shifts"].values()]
+    columns = [
+        (group_id, column, rename_column)
+        for group_id, group in enumerate(groups)
+        for column, rename_column in zip(*group, strict=False)
+    ]
+    # `Decimal` values only stay exact when all the columns are `Decimal`, as they
+    # cannot be added to floats
+    is_object = [df[column].dtype == np.object_ for _, column, _ in columns]
+    as_float = not all(is_object)
+    values = {column: _get_values(df[column], as_float) for _, column, _ in columns}
+
+    row_sums = np.zeros(
+        (len(df), len(groups)),
+        dtype=float if as_float else np.object_,
+    )
+    for group_id, column, _ in columns:
+        row_sums[:, group_id] += np.where(isna(values[column]), 0, values[column])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for group_id, column, rename_column in columns:
+            # null cells have a null contribution
+            contribution_df[rename_column] = np.divide(
+                values[column],
+                row_sums[:, group_id],
+                out=np.full(len(df), np.nan, dtype=row_sums.dtype),
+                where=~isna(values[column]),
+            )
@@ -14,16 +14,145 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-from typing import Optional
+from typing import Any, Optional
 
 import geohash as geohash_lib
+import numpy as np
 from flask_babel import gettext as _
 from geopy.point import Point
-from pandas import DataFrame
+from pandas import DataFrame, factorize, Series
 
 from superset.exceptions import InvalidPostProcessingError
 from superset.utils.pandas_postprocessing.utils import _append_columns
 
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# the precision of `geohash.encode`
+GEOHASH_PRECISION = 12
+# longer geohashes have more bits than a float mantissa, the library decodes them
+GEOHASH_MAX_VECTORIZED_LENGTH = 20
+
+_GEOHASH_ALPHABET = np.frombuffer(GEOHASH_BASE32.encode(), dtype=np.uint8)
+_GEOHASH_LOOKUP = np.full(256, -1, dtype=np.int64)
+_GEOHASH_LOOKUP[_GEOHASH_ALPHABET] = np.arange(len(GEOHASH_BASE32))
+# like `geohash.decode`, which accepts uppercase geohashes
+_GEOHASH_LOOKUP[np.frombuffer(GEOHASH_BASE32.upper().encode(), dtype=np.uint8)] = (
+    np.arange(len(GEOHASH_BASE32))
+)
+
+# decimal degrees, e.g. "41.5, -81.0", the most common format of geodetic strings;
+# anything else is parsed by geopy
+DECIMAL_POINT_PATTERN = r"^\s*([+-]?\d+(?:\.\d+)?)\s*[,;/\s]\s*([+-]?\d+(?:\.\d+)?)\s*$"
+
+
+def _encode_geohashes(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    precision: int = GEOHASH_PRECISION,
+) -> np.ndarray:
+    """
+    Encode arrays of coordinates into geohashes, like `geohash.encode`.
+
+    The bits of a geohash alternate between longitude and latitude, starting with
+    longitude; the bits of each are the index of the coordinate in a grid of
+    2^bits cells.
+    """
+    lon_bits = (precision * 5 + 1) // 2
+    lat_bits = precision * 5 // 2
+    lon_cells = _to_cells(longitudes / 180.0, lon_bits)
+    lat_cells = _to_cells(latitudes / 90.0, lat_bits)
+
+    chars = np.zeros((len(latitudes), precision), dtype=np.int64)
+    for bit in range(precision * 5):
+        if bit % 2 == 0:
+            value = lon_cells >> (lon_bits - 1 - bit // 2) & 1
+        else:
+            value = lat_cells >> (lat_bits - 1 - bit // 2) & 1
+        chars[:, bit // 5] |= value << (4 - bit % 5)
+    return _GEOHASH_ALPHABET[chars].view(f"S{precision}").ravel().astype(str)
+
+
+def _to_cells(coordinates: np.ndarray, bits: int) -> np.ndarray:
+    """
+    The grid cells of coordinates scaled to [-1, 1].
+    """
+    half = 1 << (bits - 1)
+    cells = np.floor(coordinates * half).astype(np.int64) + half
+    # the upper bound (latitude 90) is in the last cell
+    return np.minimum(cells, 2 * half - 1)
+
+
+def _decode_geohashes(geohashes: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decode geohashes into the latitudes and longitudes of the centers of their
+    cells, like `geohash.decode`. Geohashes of the same length are decoded together.
+    """
+    latitudes = np.empty(len(geohashes))
+    longitudes = np.empty(len(geohashes))
+    lengths = np.fromiter(map(len, geohashes), dtype=np.int64, count=len(geohashes))
+    for length in np.unique(lengths).tolist():
+        indexes = np.flatnonzero(lengths == length)
+        group = [geohashes[index] for index in indexes]
+        if not 0 < length <= GEOHASH_MAX_VECTORIZED_LENGTH:
+            decoded = np.array([geohash_lib.decode(value) for value in group])
+            latitudes[indexes], longitudes[indexes] = decoded[:, 0], decoded[:, 1]
+            continue
+
+        try:
+            codes = np.frombuffer("".join(group).encode("ascii"), dtype=np.uint8)
+        except UnicodeEncodeError as ex:
+            raise ValueError("Invalid geohash") from ex
+        values = _GEOHASH_LOOKUP[codes].reshape(-1, length)
+        if (values < 0).any():
+            raise ValueError("Invalid geohash")
+
+        lon_cells = np.zeros(len(group), dtype=np.int64)
+        lat_cells = np.zeros(len(group), dtype=np.int64)
+        for bit in range(length * 5):
+            value = values[:, bit // 5] >> (4 - bit % 5) & 1
+            if bit % 2 == 0:
+                lon_cells = lon_cells << 1 | value
+            else:
+                lat_cells = lat_cells << 1 | value
+
+        lon_bits = (length * 5 + 1) // 2
+        lat_bits = length * 5 // 2
+        latitudes[indexes] = (
+            lat_cells / 2.0 ** (lat_bits - 1) - 1.0
+        ) * 90.0 + 90.0 / 2.0**lat_bits
+        longitudes[indexes] = (
+            lon_cells / 2.0 ** (lon_bits - 1) - 1.0
+        ) * 180.0 + 180.0 / 2.0**lon_bits
+    return latitudes, longitudes
+
+
+def _parse_geodetic_points(locations: list[Any]) -> np.ndarray:
+    """
+    Parse geodetic point strings into an array of latitude, longitude and altitude
+    rows, like `geopy.point.Point`. Decimal degrees are parsed together, other
+    formats one by one by geopy.
+    """
+    points = np.zeros((len(locations), 3))
+    decimal = Series(locations, dtype=object).str.extract(DECIMAL_POINT_PATTERN)
+    is_decimal = decimal.notna().all(axis=1).to_numpy()
+    if is_decimal.any():
+        latitudes = np.array(decimal[0][is_decimal], dtype=float)
+        longitudes = np.array(decimal[1][is_decimal], dtype=float)
+        if (np.abs(latitudes) > 90).any():
+            raise ValueError("Latitude must be in the [-90; 90] range.")
+        # normalize longitudes to [-180; 180) like geopy
+        out_of_range = np.abs(longitudes) > 180
+        normalized = np.fmod(longitudes[out_of_range], 360.0)
+        normalized[normalized < -180] += 360.0
+        normalized[normalized >= 180] -= 360.0
+        longitudes[out_of_range] = normalized
+        points[is_decimal, 0] = latitudes
+        points[is_decimal, 1] = longitudes
+
+    for index in np.flatnonzero(~is_decimal).tolist():
+        point = Point(locations[index])
+        points[index] = point[0], point[1], point[2]
+    return points
+
 
 def geohash_decode(
     df: DataFrame, geohash: str, longitude: str, latitude: str
@@ -38,9 +167,19 @@ def geohash_decode(
     :return: DataFrame with decoded longitudes and latitudes
     """
     try:
-        lonlat_df = DataFrame()
-        lonlat_df["latitude"], lonlat_df["longitude"] = zip(
-            *df[geohash].apply(geohash_lib.decode), strict=False
+        # each distinct geohash is decoded once, null geohashes decode to null
+        codes, uniques = factorize(df[geohash])
+        geohashes = uniques.tolist()
+        if not all(isinstance(value, str) for value in geohashes):
+            raise ValueError("Invalid geohash")
+        latitudes, longitudes = _decode_geohashes(geohashes)
+        is_null = codes < 0
+        lonlat_df = DataFrame(
+            {
+                "latitude": np.where(is_null, np.nan, latitudes[codes]),
+                "longitude": np.where(is_null, np.nan, longitudes[codes]),
+            },
+            index=df.index,
         )
         return _append_columns(
             df, lonlat_df, {"latitude": latitude, "longitude": longitude}
@@ -65,12 +204,23 @@ def geohash_encode(
     :return: DataFrame with decoded longitudes and latitudes
     """
     try:
-        encode_df = df[[latitude, longitude]]
-        encode_df.columns = ["latitude", "longitude"]
-        encode_df["geohash"] = encode_df.apply(
-            lambda row: geohash_lib.encode(row["latitude"], row["longitude"]),
-            axis=1,
+        latitudes = df[latitude].to_numpy(dtype=float, na_value=np.nan)
+        longitudes = df[longitude].to_numpy(dtype=float, na_value=np.nan)
+        is_null = np.isnan(latitudes) | np.isnan(longitudes)
+        latitudes = np.where(is_null, 0.0, latitudes)
+        longitudes = np.where(is_null, 0.0, longitudes)
+        if ((latitudes > 90) | (latitudes < -90) | np.isinf(longitudes)).any():
+            raise ValueError("Invalid latitude")
+        # wrap longitudes to [-180; 180) like `geohash.encode`
+        longitudes = np.where(
+            (longitudes < -180) | (longitudes >= 180),
+            np.mod(longitudes + 180.0, 360.0) - 180.0,
+            longitudes,
         )
+
+        geohashes = _encode_geohashes(latitudes, longitudes).astype(object)
+        geohashes[is_null] = None
+        encode_df = DataFrame({"geohash": geohashes}, index=df.index)
         return _append_columns(df, encode_df, {"geohash": geohash})
     except ValueError as ex:
         raise InvalidPostProcessingError(_("Invalid longitude/latitude")) from ex
@@ -94,22 +244,16 @@ def geodetic_parse(
     :param altitude: Name of new column to be created containing altitude.
     :return: DataFrame with decoded longitudes and latitudes
     """
-
-    def _parse_location(location: str) -> tuple[float, float, float]:
-        """
-        Parse a string containing a geodetic point and return latitude, longitude
-        and altitude
-        """
-        point = Point(location)
-        return point[0], point[1], point[2]
-
     try:
-        geodetic_df = DataFrame()
-        (
-            geodetic_df["latitude"],
-            geodetic_df["longitude"],
-            geodetic_df["altitude"],
-        ) = zip(*df[geodetic].apply(_parse_location), strict=False)
+        # each distinct point is parsed once, null points parse to null
+        codes, locations = factorize(df[geodetic])
+        points = _parse_geodetic_points(locations.tolist())[codes]
+        points[codes < 0] = np.nan
+        geodetic_df = DataFrame(
+            points,
+            columns=["latitude", "longitude", "altitude"],
+            index=df.index,
+        )
         columns = {"latitude": latitude, "longitude": longitude}
         if altitude:
             columns["altitude"] = altitude
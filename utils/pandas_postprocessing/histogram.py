@@ -17,7 +17,7 @@
 from __future__ import annotations
 
 import numpy as np
-from pandas import DataFrame, Series, to_numeric
+from pandas import DataFrame, Index, to_numeric
 
 
 # pylint: disable=too-many-arguments
@@ -63,23 +63,32 @@ def histogram(
         f"{bin_edges[i]} - {bin_edges[i + 1]}" for i in range(len(bin_edges) - 1)
     ]
 
-    def hist_values(series: Series) -> np.ndarray:
-        # we might have NaN values as the result of grouping so we need to drop them
-        result = np.histogram(series.dropna(), bins=bin_edges)[0]
-        return result if not cumulative else np.cumsum(result)
+    # the bin of each value; like np.histogram, the last bin includes its upper edge
+    bins_count = len(bin_edges) - 1
+    bin_indexes = np.minimum(np.digitize(df[column].to_numpy(), bin_edges), bins_count)
+    bin_indexes -= 1
 
     if len(groupby) == 0:
         # without grouping
-        hist_dict = dict(zip(bin_edges_str, hist_values(df[column]), strict=False))
-        histogram_df = DataFrame(hist_dict, index=[0])
+        index = Index([0])
+        group_codes = np.zeros(len(df), dtype=np.int64)
     else:
-        # with grouping
-        histogram_df = (
-            df.groupby(groupby)[column]
-            .apply(lambda x: Series(hist_values(x)))
-            .unstack(fill_value=0)
-        )
-        histogram_df.columns = bin_edges_str
+        # with grouping, rows with null groupby values are in no group
+        df_groupby = df.groupby(groupby)
+        index = df_groupby.size().index
+        codes = df_groupby.ngroup()
+        in_group = codes.notna().to_numpy()
+        group_codes = codes.to_numpy()[in_group].astype(np.int64)
+        bin_indexes = bin_indexes[in_group]
+
+    # count the values of all groups at once, as a (group, bin) matrix
+    counts = np.bincount(
+        group_codes * bins_count + bin_indexes,
+        minlength=len(index) * bins_count,
+    ).reshape(len(index), bins_count)
+    if cumulative:
+        counts = np.cumsum(counts, axis=1)
+    histogram_df = DataFrame(counts, index=index, columns=bin_edges_str)
 
     if normalize:
         histogram_df = histogram_df / histogram_df.values.sum()
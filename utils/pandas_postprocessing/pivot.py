@@ -18,6 +18,7 @@ from typing import Any, Optional
 
 from flask_babel import gettext as _
 from pandas import DataFrame
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
 
 from superset.constants import NULL_STRING, PandasAxis
 from superset.exceptions import InvalidPostProcessingError
@@ -26,6 +27,17 @@ from superset.utils.pandas_postprocessing.utils import (
     validate_column_args,
 )
 
+# numpy operators that give the same result as a built-in pandas aggregation, which
+# runs over all groups at once instead of calling the numpy function for each group.
+# `np.ma.count` counts nulls too, like `size`
+PIVOT_AGGREGATES = {
+    "count": "size",
+    "max": "max",
+    "mean": "mean",
+    "min": "min",
+    "sum": "sum",
+}
+
 
 @validate_column_args("index", "columns")
 def pivot(  # pylint: disable=too-many-arguments
@@ -77,7 +89,12 @@ def pivot(  # pylint: disable=too-many-arguments
 
     # TODO (villebro): Pandas 1.0.3 doesn't yet support NamedAgg in pivot_table.
     #  Remove once/if support is added.
-    aggfunc = {na.column: na.aggfunc for na in aggregate_funcs.values()}
+    aggfunc = {
+        na.column: _get_pivot_aggfunc(
+            df, aggregates[name], na.column, na.aggfunc, bool(marginal_distributions)
+        )
+        for name, na in aggregate_funcs.items()
+    }
 
     # When dropna = False, the pivot_table function will calculate cartesian-product
     # for MultiIndex.
@@ -85,9 +102,13 @@ def pivot(  # pylint: disable=too-many-arguments
     # https://github.com/pandas-dev/pandas/issues/18030
     series_set = set()
     if not drop_missing_columns and columns:
-        for row in df[columns].itertuples():
-            for metric in aggfunc.keys():
-                series_set.add(tuple([metric]) + tuple(row[1:]))  # noqa: C409
+        # the combinations of column values that exist, for each metric
+        column_values = df[columns].drop_duplicates()
+        series_set = {
+            (metric, *row)
+            for row in column_values.itertuples(index=False, name=None)
+            for metric in aggfunc
+        }
 
     df = df.pivot_table(
         values=aggfunc.keys(),
@@ -107,3 +128,38 @@ def pivot(  # pylint: disable=too-many-arguments
         df = df.stack(0).unstack()
 
     return df
+
+
+def _get_pivot_aggfunc(
+    df: DataFrame,
+    aggregate: dict[str, Any],
+    column: str,
+    aggfunc: Any,
+    margins: bool,
+) -> Any:
+    """
+    Replace an aggregate function with the equivalent built-in pandas aggregation,
+    if there is one.
+
+    :param df: DataFrame on which the pivot is performed
+    :param aggregate: The aggregate config
+    :param column: The aggregated column
+    :param aggfunc: The aggregate function, see `_get_aggregate_funcs`
+    :param margins: Whether the pivot adds marginal distributions
+    :return: The name of a pandas aggregation, or `aggfunc`
+    """
+    operator = aggregate["operator"]
+    if (
+        not isinstance(operator, str)
+        or operator not in PIVOT_AGGREGATES
+        or aggregate.get("options")
+        # the margins of `pivot_table` do not support `size`
+        or (margins and operator == "count")
+    ):
+        return aggfunc
+    # numpy and pandas differ on the types of sums, etc. of non-numeric values
+    if operator != "count" and (
+        not is_numeric_dtype(df[column]) or is_bool_dtype(df[column])
+    ):
+        return aggfunc
+    return PIVOT_AGGREGATES[operator]
@@ -15,18 +15,73 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
-from typing import Optional, Union
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Union
 
 import pandas as pd
+from flask import current_app
 from flask_babel import gettext as _
 from pandas import DataFrame
 
 from superset.exceptions import InvalidPostProcessingError
 from superset.utils.core import DTTM_ALIAS
 from superset.utils.decorators import suppress_logging
+from superset.utils.hashing import md5_sha_from_dict
 from superset.utils.pandas_postprocessing.utils import PROPHET_TIME_GRAIN_MAP
 
 
+class _ProphetModelCache:
+    """
+    In-process LRU of fitted models, keyed on the series and the model parameters,
+    so that forecasting the same series again, e.g. with more periods, only predicts.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._models: OrderedDict[str, Any] = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if (model := self._models.get(key)) is not None:
+                self._models.move_to_end(key)
+            return model
+
+    def set(self, key: str, model: Any) -> None:
+        max_size = current_app.config["PROPHET_MODEL_CACHE_MAX_SIZE"]
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > max_size:
+                self._models.popitem(last=False)
+
+    def get_executor(self) -> Optional[ThreadPoolExecutor]:
+        """
+        The pool fitting series in parallel, shared by all forecasts of the process so
+        that ``PROPHET_MAX_WORKERS`` bounds the concurrent fits.
+        """
+        max_workers = current_app.config["PROPHET_MAX_WORKERS"]
+        if max_workers <= 1:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="prophet",
+                )
+            return self._executor
+
+
+_model_cache = _ProphetModelCache()
+
+
 def _prophet_parse_seasonality(
     input_value: Optional[Union[bool, int]],
 ) -> Union[bool, str, int]:
@@ -51,7 +106,44 @@ def _prophet_fit_and_predict(  # pylint: disable=too-many-arguments
 ) -> DataFrame:
     """
     Fit a prophet model and return a DataFrame with predicted results.
+
+    Fitted models are cached on the series and the model parameters.
     """
+    if df["ds"].dt.tz:
+        df["ds"] = df["ds"].dt.tz_convert(None)
+    cache_key = md5_sha_from_dict(
+        {
+            "series": pd.util.hash_pandas_object(df[["ds", "y"]], index=False)
+            .to_numpy()
+            .tobytes()
+            .hex(),
+            "confidence_interval": confidence_interval,
+            "yearly_seasonality": yearly_seasonality,
+            "weekly_seasonality": weekly_seasonality,
+            "daily_seasonality": daily_seasonality,
+        }
+    )
+    if (model := _model_cache.get(cache_key)) is None:
+        model = _prophet_fit(
+            df,
+            confidence_interval,
+            yearly_seasonality,
+            weekly_seasonality,
+            daily_seasonality,
+        )
+        _model_cache.set(cache_key, model)
+    future = model.make_future_dataframe(periods=periods, freq=freq)
+    forecast = model.predict(future)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+    return forecast.join(df.set_index("ds"), on="ds").set_index(["ds"])
+
+
+def _prophet_fit(
+    df: DataFrame,
+    confidence_interval: float,
+    yearly_seasonality: Union[bool, str, int],
+    weekly_seasonality: Union[bool, str, int],
+    daily_seasonality: Union[bool, str, int],
+) -> Any:
     try:
         # `prophet` complains about `plotly` not being installed
         with suppress_logging("prophet.plot"):
@@ -69,12 +161,8 @@ def _prophet_fit_and_predict(  # pylint: disable=too-many-arguments
         weekly_seasonality=weekly_seasonality,
         daily_seasonality=daily_seasonality,
     )
-    if df["ds"].dt.tz:
-        df["ds"] = df["ds"].dt.tz_convert(None)
     model.fit(df)
-    future = model.make_future_dataframe(periods=periods, freq=freq)
-    forecast = model.predict(future)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
-    return forecast.join(df.set_index("ds"), on="ds").set_index(["ds"])
+    return model
 
 
 def prophet(  # pylint: disable=too-many-arguments
@@ -139,21 +227,38 @@ def prophet(  # pylint: disable=too-many-arguments
 
     target_df = DataFrame()
 
-    for column in [
+    columns = [
         column
         for column in df.columns
         if column != index
         and pd.to_numeric(df[column], errors="coerce").notnull().all()
-    ]:
-        fit_df = _prophet_fit_and_predict(
-            df=df[[index, column]].rename(columns={index: "ds", column: "y"}),
-            confidence_interval=confidence_interval,
-            yearly_seasonality=_prophet_parse_seasonality(yearly_seasonality),
-            weekly_seasonality=_prophet_parse_seasonality(weekly_seasonality),
-            daily_seasonality=_prophet_parse_seasonality(daily_seasonality),
-            periods=periods,
-            freq=freq,
-        )
+    ]
+    fit_kwargs: list[dict[str, Any]] = [
+        {
+            "df": df[[index, column]].rename(columns={index: "ds", column: "y"}),
+            "confidence_interval": confidence_interval,
+            "yearly_seasonality": _prophet_parse_seasonality(yearly_seasonality),
+            "weekly_seasonality": _prophet_parse_seasonality(weekly_seasonality),
+            "daily_seasonality": _prophet_parse_seasonality(daily_seasonality),
+            "periods": periods,
+            "freq": freq,
+        }
+        for column in columns
+    ]
+    # the fits run in the cmdstan processes of prophet, so threads run them in
+    # parallel
+    if len(columns) > 1 and (executor := _model_cache.get_executor()):
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+
+        def fit_and_predict(kwargs: dict[str, Any]) -> DataFrame:
+            with app.app_context():
+                return _prophet_fit_and_predict(**kwargs)
+
+        fit_dfs = list(executor.map(fit_and_predict, fit_kwargs))
+    else:
+        fit_dfs = [_prophet_fit_and_predict(**kwargs) for kwargs in fit_kwargs]
+
+    for column, fit_df in zip(columns, fit_dfs):
         new_columns = [
             f"{column}__yhat",
             f"{column}__yhat_lower",
@@ -17,14 +17,17 @@
 
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING
+from typing import Any, Iterable, TYPE_CHECKING
 
-from sqlalchemy import and_, or_
+from flask import g
+from sqlalchemy import literal, or_, select, union_all
 
 from superset import db
 from superset.sql.parse import Table
+from superset.utils.core import get_username
 
 if TYPE_CHECKING:
+    from superset.connectors.sqla.models import SqlaTable
     from superset.models.core import Database
     from superset.sql.parse import BaseSQLStatement
 
@@ -43,25 +46,29 @@ def apply_rls(
     # safer, but not supported in all databases.
     method = database.db_engine_spec.get_rls_method()
 
-    # collect all RLS predicates for all tables in the query
-    predicates: dict[Table, list[Any]] = {}
-    for table in parsed_statement.tables:
-        # fully qualify table
-        table = Table(
+    # fully qualify tables
+    tables = [
+        Table(
             table.table,
             table.schema or schema,
             table.catalog or catalog,
         )
+        for table in parsed_statement.tables
+    ]
 
-        predicates[table] = [
+    # collect all RLS predicates for all tables in the query
+    predicates: dict[Table, list[Any]] = {
+        table: [
             parsed_statement.parse_predicate(predicate)
-            for predicate in get_predicates_for_table(
-                table,
-                database,
-                database.get_default_catalog(),
-            )
+            for predicate in table_predicates
             if predicate
         ]
+        for table, table_predicates in get_predicates_for_tables(
+            tables,
+            database,
+            database.get_default_catalog(),
+        ).items()
+    }
 
     parsed_statement.apply_rls(catalog, schema, predicates, method)
 
@@ -78,38 +85,110 @@ def get_predicates_for_table(
     table must be fully qualified, with catalog (null if the DB doesn't support) and
     schema.
     """
-    from superset.connectors.sqla.models import SqlaTable
+    return get_predicates_for_tables([table], database, default_catalog)[table]
+
 
+def get_predicates_for_tables(
+    tables: Iterable[Table],
+    database: Database,
+    default_catalog: str | None,
+) -> dict[Table, list[str]]:
+    """
+    Get the RLS predicates for several tables.
+
+    All tables are resolved to datasets with a single query, and the compiled
+    predicates of each dataset are memoized for the rest of the request, so that the
+    statements of a script referencing the same tables only compile them once. Tables
+    must be fully qualified, as in ``get_predicates_for_table``.
+    """
+    tables = list(dict.fromkeys(tables))
+    datasets = _get_datasets_for_tables(tables, database, default_catalog)
+    if not datasets:
+        return {table: [] for table in tables}
+
+    dialect = database.get_dialect()
+    compiled: dict[tuple[Any, ...], list[str]] = g.setdefault(
+        "rls_compiled_predicates", {}
+    )
+    predicates: dict[Table, list[str]] = {}
+    for table in tables:
+        if not (dataset := datasets.get(table)):
+            predicates[table] = []
+            continue
+
+        key = (database.id, dataset.id, dialect.name, get_username())
+        if key not in compiled:
+            compiled[key] = [
+                str(
+                    predicate.compile(
+                        dialect=dialect,
+                        compile_kwargs={"literal_binds": True},
+                    )
+                )
+                for predicate in dataset.get_sqla_row_level_filters()
+            ]
+        predicates[table] = list(compiled[key])
+
+    return predicates
+
+
+def _get_catalog_predicate(
+    model: type[SqlaTable],
+    table: Table,
+    default_catalog: str | None,
+) -> Any:
     # if the dataset in the RLS has null catalog, match it when using the default
     # catalog
-    catalog_predicate = SqlaTable.catalog == table.catalog
+    catalog_predicate = model.catalog == table.catalog
     if table.catalog and table.catalog == default_catalog:
         catalog_predicate = or_(
             catalog_predicate,
-            SqlaTable.catalog.is_(None),
+            model.catalog.is_(None),
         )
+    return catalog_predicate
+
 
-    dataset = (
-        db.session.query(SqlaTable)
-        .filter(
-            and_(
+def _get_datasets_for_tables(
+    tables: list[Table],
+    database: Database,
+    default_catalog: str | None,
+) -> dict[Table, SqlaTable]:
+    """
+    Resolve fully qualified tables to datasets with a single query.
+
+    A dataset with a null catalog matches a table in the default catalog; a dataset
+    with an explicit catalog takes precedence.
+    """
+    from superset.connectors.sqla.models import SqlaTable
+
+    if not tables:
+        return {}
+
+    # tag the datasets matching each table with its index, so that the database
+    # matches the names with its own collation
+    matches = union_all(
+        *(
+            select(
+                literal(index).label("table_index"),
+                SqlaTable.id.label("dataset_id"),
+            ).where(
                 SqlaTable.database_id == database.id,
-                catalog_predicate,
+                _get_catalog_predicate(SqlaTable, table, default_catalog),
                 SqlaTable.schema == table.schema,
                 SqlaTable.table_name == table.table,
             )
+            for index, table in enumerate(tables)
         )
-        .one_or_none()
-    )
-    if not dataset:
-        return []
-
-    return [
-        str(
-            predicate.compile(
-                dialect=database.get_dialect(),
-                compile_kwargs={"literal_binds": True},
-            )
-        )
-        for predicate in dataset.get_sqla_row_level_filters()
-    ]
+    ).subquery()
+
+    datasets: dict[Table, SqlaTable] = {}
+    for table_index, dataset in db.session.query(
+        matches.c.table_index,
+        SqlaTable,
+    ).join(SqlaTable, SqlaTable.id == matches.c.dataset_id):
+        table = tables[table_index]
+        # a dataset with an explicit catalog takes precedence
+        if table not in datasets or datasets[table].catalog is None:
+            datasets[table] = dataset
+
+    return datasets
@@ -18,6 +18,10 @@ from __future__ import annotations
 
 import base64
 import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from io import BytesIO
@@ -46,6 +50,15 @@ DEFAULT_CHART_WINDOW_SIZE = DEFAULT_CHART_THUMBNAIL_SIZE = 800, 600
 DEFAULT_DASHBOARD_WINDOW_SIZE = 1600, 1200
 DEFAULT_DASHBOARD_THUMBNAIL_SIZE = 800, 600
 
+# the element of a chart in a dashboard
+DASHBOARD_CHART_SELECTOR = '[data-test-chart-id="{chart_id}"]'
+
+# held by the worker computing a thumbnail, see `BaseScreenshot.claim`
+THUMBNAIL_COMPUTE_LOCK_KEY = "thumbnail_compute_lock:{cache_key}"
+
+# notified whenever a compute of this process finishes
+_compute_finished = threading.Condition()
+
 try:
     from PIL import Image
 except ModuleNotFoundError:
@@ -55,6 +68,8 @@ if TYPE_CHECKING:
     from flask_appbuilder.security.sqla.models import User
     from flask_caching import Cache
 
+    from superset.stats_logger import BaseStatsLogger
+
 
 class StatusValues(Enum):
     PENDING = "Pending"
@@ -138,11 +153,22 @@ class ScreenshotCachePayload:
             datetime.now() - datetime.fromisoformat(self.get_timestamp())
         ).total_seconds() > error_cache_ttl
 
+    def is_compute_lease_expired(self) -> bool:
+        lease_timeout = app.config["THUMBNAIL_COMPUTE_LEASE_TIMEOUT"]
+        return (
+            self.status == StatusValues.COMPUTING
+            and (
+                datetime.now() - datetime.fromisoformat(self.get_timestamp())
+            ).total_seconds()
+            > lease_timeout
+        )
+
     def should_trigger_task(self, force: bool = False) -> bool:
         return (
             force
             or self.status == StatusValues.PENDING
             or (self.status == StatusValues.ERROR and self.is_error_cache_ttl_expired())
+            or self.is_compute_lease_expired()
         )
 
 
@@ -217,6 +243,92 @@ class BaseScreenshot:
         logger.info("Failed at getting from cache: %s", cache_key)
         return None
 
+    @classmethod
+    def claim(cls, cache_key: str) -> str | None:
+        """
+        Atomically claim the computation of a thumbnail, returning the token to
+        release it with, or ``None`` if another worker holds the claim.
+
+        Claims expire after ``THUMBNAIL_COMPUTE_LEASE_TIMEOUT`` seconds, so that a
+        worker dying while computing does not block the thumbnail.
+        """
+        token = uuid.uuid4().hex
+        try:
+            claimed = cls.cache.add(
+                THUMBNAIL_COMPUTE_LOCK_KEY.format(cache_key=cache_key),
+                token,
+                timeout=app.config["THUMBNAIL_COMPUTE_LEASE_TIMEOUT"],
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not claim thumbnail: %s", cache_key, exc_info=True)
+            return token
+        return token if claimed else None
+
+    @classmethod
+    def release(cls, cache_key: str, token: str) -> None:
+        """
+        Release a claim, and wake up the waiters of this process.
+
+        The cache has no compare-and-delete, so the claim is read then deleted. A
+        claim that expires, and is claimed again, in between is deleted too: this
+        only happens to a compute that outlived its lease, and at worst lets a
+        third worker compute the same thumbnail, whose result is the same.
+        """
+        lock_key = THUMBNAIL_COMPUTE_LOCK_KEY.format(cache_key=cache_key)
+        try:
+            # the lease may have expired and been claimed by another worker
+            if cls.cache.get(lock_key) == token:
+                cls.cache.delete(lock_key)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not release thumbnail: %s", cache_key, exc_info=True)
+        with _compute_finished:
+            _compute_finished.notify_all()
+
+    @classmethod
+    def is_claimed(cls, cache_key: str) -> bool:
+        lock_key = THUMBNAIL_COMPUTE_LOCK_KEY.format(cache_key=cache_key)
+        try:
+            return cls.cache.get(lock_key) is not None
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not read thumbnail claim: %s", cache_key)
+            return False
+
+    @classmethod
+    def wait_for_compute(
+        cls,
+        cache_key: str,
+        timeout: float,
+    ) -> ScreenshotCachePayload | None:
+        """
+        Wait for the worker holding the claim on a thumbnail to release it.
+
+        Computes of this process wake up the waiters when they finish, computes of
+        other workers are polled every ``THUMBNAIL_COMPUTE_POLL_INTERVAL`` seconds.
+        Claims expire with their lease, so a worker dying while computing does not
+        block the waiters longer than that.
+
+        :param cache_key: The cache key of the thumbnail
+        :param timeout: The maximum number of seconds to wait
+        :return: The payload, still computing if the timeout was reached
+        """
+        poll_interval = app.config["THUMBNAIL_COMPUTE_POLL_INTERVAL"]
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not cls.is_claimed(cache_key):
+                return cls.get_from_cache_key(cache_key)
+            with _compute_finished:
+                _compute_finished.wait(min(poll_interval, remaining))
+
+    @classmethod
+    def is_computed(cls, payload: ScreenshotCachePayload, force: bool) -> bool:
+        """
+        Whether a thumbnail is cached or being computed by a live worker.
+        """
+        if force or payload.is_compute_lease_expired():
+            return False
+        return payload.status in [StatusValues.COMPUTING, StatusValues.UPDATED]
+
     def compute_and_cache(  # pylint: disable=too-many-arguments
         self,
         force: bool,
@@ -228,6 +340,9 @@ class BaseScreenshot:
         """
         Computes the thumbnail and caches the result
 
+        When another worker is computing the thumbnail, waits for it to finish, for
+        at most ``THUMBNAIL_COMPUTE_WAIT_TIMEOUT`` seconds.
+
         :param user: If no user is given will use the current context
         :param cache: The cache to keep the thumbnail payload
         :param window_size: The window size from which will process the thumb
@@ -235,16 +350,57 @@ class BaseScreenshot:
         :param force: Will force the computation even if it's already cached
         :return: Image payload
         """
+        stats_logger = app.config["STATS_LOGGER"]
         cache_key = cache_key or self.get_cache_key(window_size, thumb_size)
         cache_payload = self.get_from_cache_key(cache_key) or ScreenshotCachePayload()
-        if (
-            cache_payload.status in [StatusValues.COMPUTING, StatusValues.UPDATED]
-            and not force
-        ):
+        if self.is_computed(cache_payload, force):
+            logger.info(
+                "Skipping compute - already processed for thumbnail: %s", cache_key
+            )
+            if cache_payload.status == StatusValues.COMPUTING:
+                stats_logger.incr("screenshot.compute.deduplicated")
+                self.wait_for_compute(
+                    cache_key, app.config["THUMBNAIL_COMPUTE_WAIT_TIMEOUT"]
+                )
+            return
+
+        # workers that read the payload at the same time race for the claim
+        if (token := self.claim(cache_key)) is None:
+            logger.info(
+                "Skipping compute - already processing thumbnail: %s", cache_key
+            )
+            stats_logger.incr("screenshot.compute.deduplicated")
+            self.wait_for_compute(
+                cache_key, app.config["THUMBNAIL_COMPUTE_WAIT_TIMEOUT"]
+            )
+            return
+        try:
+            self._compute_and_cache(
+                force, user, window_size, thumb_size, cache_key, stats_logger
+            )
+        finally:
+            self.release(cache_key, token)
+
+    def _compute_and_cache(  # pylint: disable=too-many-arguments
+        self,
+        force: bool,
+        user: User,
+        window_size: WindowSize | None,
+        thumb_size: WindowSize | None,
+        cache_key: str,
+        stats_logger: BaseStatsLogger,
+    ) -> None:
+        # the claim may have been won after another worker finished the thumbnail
+        cache_payload = self.get_from_cache_key(cache_key) or ScreenshotCachePayload()
+        if cache_payload.status == StatusValues.UPDATED and not force:
             logger.info(
                 "Skipping compute - already processed for thumbnail: %s", cache_key
             )
+            stats_logger.incr("screenshot.compute.deduplicated")
             return
+        if cache_payload.is_compute_lease_expired():
+            logger.info("Reclaiming abandoned thumbnail: %s", cache_key)
+            stats_logger.incr("screenshot.compute.reclaimed")
 
         window_size = window_size or self.window_size
         thumb_size = thumb_size or self.thumb_size
@@ -361,3 +517,85 @@ class DashboardScreenshot(BaseScreenshot):
             "permalink_key": permalink_key,
         }
         return md5_sha_from_dict(args)
+
+    def compute_and_cache_charts(
+        self,
+        charts: dict[int, ChartScreenshot],
+        user: User = None,
+        force: bool = False,
+    ) -> None:
+        """
+        Computes the thumbnails of charts of this dashboard from a single page load,
+        and caches each one under the cache key of its ``ChartScreenshot``
+
+        Images are resized in a thread pool while the next charts are captured.
+        Charts that cannot be captured from the dashboard, e.g. because they are in
+        another tab, are set back to pending so that they are computed on their own.
+
+        :param charts: The chart screenshots, by chart id
+        :param user: If no user is given will use the current context
+        :param force: Will force the computation even if it's already cached
+        """
+        stats_logger = app.config["STATS_LOGGER"]
+        payloads: dict[int, tuple[str, ScreenshotCachePayload]] = {}
+        tokens: dict[str, str] = {}
+        for chart_id, chart in charts.items():
+            cache_key = chart.get_cache_key()
+            payload = chart.get_from_cache_key(cache_key) or ScreenshotCachePayload()
+            if chart.is_computed(payload, force):
+                continue
+            if (token := chart.claim(cache_key)) is None:
+                stats_logger.incr("screenshot.compute.deduplicated")
+                continue
+            tokens[cache_key] = token
+            payload.computing()
+            chart.cache.set(cache_key, payload.to_dict())
+            payloads[chart_id] = (cache_key, payload)
+        try:
+            if payloads:
+                self._compute_and_cache_charts(charts, payloads, user)
+        finally:
+            for cache_key, token in tokens.items():
+                ChartScreenshot.release(cache_key, token)
+
+    def _compute_and_cache_charts(
+        self,
+        charts: dict[int, ChartScreenshot],
+        payloads: dict[int, tuple[str, ScreenshotCachePayload]],
+        user: User,
+    ) -> None:
+        selectors = {
+            chart_id: DASHBOARD_CHART_SELECTOR.format(chart_id=chart_id)
+            for chart_id in payloads
+        }
+        futures: dict[int, Future[bytes]] = {}
+        with ThreadPoolExecutor(
+            max_workers=app.config["SCREENSHOT_RESIZE_WORKERS"]
+        ) as executor:
+            try:
+                with event_logger.log_context(
+                    f"screenshot.compute.{self.thumbnail_type}.charts"
+                ):
+                    for chart_id, image in self.driver().get_element_screenshots(
+                        self.url, self.element, selectors, user
+                    ):
+                        if image:
+                            futures[chart_id] = executor.submit(
+                                charts[chart_id].resize_image,
+                                image,
+                                thumb_size=charts[chart_id].thumb_size,
+                            )
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Failed at generating thumbnails %s", ex, exc_info=True)
+
+        for chart_id, (cache_key, payload) in payloads.items():
+            if future := futures.get(chart_id):
+                try:
+                    payload.update(future.result())
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.warning("Failed at resizing thumbnail %s", ex, exc_info=True)
+                    payload.error()
+            else:
+                payload.pending()
+            charts[chart_id].cache.set(cache_key, payload.to_dict())
+        logger.info("Updated %i chart thumbnails of %s", len(futures), self.url)
@@ -18,10 +18,13 @@
 from __future__ import annotations
 
 import logging
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager
 from enum import Enum
 from time import sleep
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
 
 from flask import current_app
 from packaging import version
@@ -40,6 +43,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 from superset import feature_flag_manager
 from superset.extensions import machine_auth_provider_factory
+from superset.utils.browser_pool import playwright_pool, selenium_pool
 from superset.utils.retries import retry_call
 
 WindowSize = tuple[int, int]
@@ -50,15 +54,32 @@ if TYPE_CHECKING:
 
 if feature_flag_manager.is_feature_enabled("PLAYWRIGHT_REPORTS_AND_THUMBNAILS"):
     from playwright.sync_api import (
+        Browser,
         BrowserContext,
         Error as PlaywrightError,
         Locator,
         Page,
+        Playwright,
         sync_playwright,
         TimeoutError as PlaywrightTimeout,
     )
 
 
+# Render ready protocol: pages that support it set this attribute on the document
+# element as soon as they start rendering charts, and set it to "ready" once every
+# chart is fully drawn (including animations). They may also publish the render
+# time of each chart, in milliseconds, in ``window.supersetChartRenderTimes``.
+# Screenshots of these pages skip the fixed headstart and animation waits.
+RENDER_STATE_ATTRIBUTE = "data-render-state"
+RENDER_STATE_PRESENT_JS = (
+    f"document.documentElement.hasAttribute('{RENDER_STATE_ATTRIBUTE}')"
+)
+RENDER_STATE_READY_JS = (
+    f"document.documentElement.getAttribute('{RENDER_STATE_ATTRIBUTE}') === 'ready'"
+)
+CHART_RENDER_TIMES_JS = "window.supersetChartRenderTimes || null"
+
+
 class DashboardStandaloneMode(Enum):
     HIDE_NAV = 1
     HIDE_NAV_AND_TITLE = 2
@@ -84,6 +105,34 @@ class WebDriverProxy(ABC):
         Run webdriver and return a screenshot
         """
 
+    @abstractmethod
+    def get_element_screenshots(
+        self,
+        url: str,
+        element_name: str,
+        selectors: dict[Hashable, str],
+        user: User,
+    ) -> Iterator[tuple[Hashable, bytes | None]]:
+        """
+        Load ``url`` once and screenshot the first element matching each CSS
+        selector, yielding ``(key, image)`` pairs as they are captured. The image
+        is ``None`` for selectors that match nothing or fail.
+        """
+
+    @staticmethod
+    def record_render_timings(url: str, elapsed: float, timings: Any) -> None:
+        """
+        Record the time until the render ready signal, and the per-chart render
+        times (in milliseconds, keyed by chart) published by the page.
+        """
+        stats_logger = current_app.config["STATS_LOGGER"]
+        stats_logger.timing("screenshot.render_ready", elapsed * 1000)
+        if isinstance(timings, dict):
+            for render_ms in timings.values():
+                if isinstance(render_ms, (int, float)):
+                    stats_logger.timing("screenshot.chart_render", render_ms)
+            logger.info("Chart render times (ms) at url %s: %s", url, timings)
+
 
 class WebDriverPlaywright(WebDriverProxy):
     @staticmethod
@@ -136,23 +185,61 @@ class WebDriverPlaywright(WebDriverProxy):
 
         return error_messages
 
-    def get_screenshot(  # pylint: disable=too-many-locals, too-many-statements  # noqa: C901
-        self, url: str, element_name: str, user: User
-    ) -> bytes | None:
-        with sync_playwright() as playwright:
-            browser_args = current_app.config["WEBDRIVER_OPTION_ARGS"]
-            browser = playwright.chromium.launch(args=browser_args)
-            pixel_density = current_app.config["WEBDRIVER_WINDOW"].get(
-                "pixel_density", 1
-            )
-            context = browser.new_context(
-                bypass_csp=True,
-                viewport={
-                    "height": self._window[1],
-                    "width": self._window[0],
-                },
-                device_scale_factor=pixel_density,
+    @staticmethod
+    def launch() -> tuple[Playwright, Browser]:
+        playwright = sync_playwright().start()
+        try:
+            browser = playwright.chromium.launch(
+                args=current_app.config["WEBDRIVER_OPTION_ARGS"]
             )
+        except Exception:
+            playwright.stop()
+            raise
+        return playwright, browser
+
+    @staticmethod
+    def close(launched: tuple[Playwright, Browser]) -> None:
+        playwright, browser = launched
+        try:
+            browser.close()
+        finally:
+            playwright.stop()
+
+    @contextmanager
+    def browser_session(self) -> Iterator[Browser]:
+        """
+        Provide a browser, from the pool with ``SCREENSHOT_BROWSER_POOL_ENABLED``
+        """
+        if not current_app.config["SCREENSHOT_BROWSER_POOL_ENABLED"]:
+            with sync_playwright() as playwright:
+                browser_args = current_app.config["WEBDRIVER_OPTION_ARGS"]
+                yield playwright.chromium.launch(args=browser_args)
+            return
+
+        with playwright_pool.checkout(
+            "chromium",
+            self.launch,
+            self.close,
+            lambda launched: launched[1].is_connected(),
+        ) as (_, browser):
+            yield browser
+
+    @contextmanager
+    def open_page(self, browser: Browser, url: str, user: User) -> Iterator[Page]:
+        """
+        Open ``url`` as ``user`` in a new browser context, which isolates the
+        cookies and storage of each user and is closed afterwards.
+        """
+        pixel_density = current_app.config["WEBDRIVER_WINDOW"].get("pixel_density", 1)
+        context = browser.new_context(
+            bypass_csp=True,
+            viewport={
+                "height": self._window[1],
+                "width": self._window[0],
+            },
+            device_scale_factor=pixel_density,
+        )
+        try:
             context.set_default_timeout(
                 current_app.config["SCREENSHOT_PLAYWRIGHT_DEFAULT_TIMEOUT"]
             )
@@ -169,56 +256,147 @@ class WebDriverPlaywright(WebDriverProxy):
                     current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_EVENT"],
                     url,
                 )
+            yield page
+        finally:
+            context.close()
 
-            img: bytes | None = None
-            selenium_headstart = current_app.config["SCREENSHOT_SELENIUM_HEADSTART"]
-            logger.debug("Sleeping for %i seconds", selenium_headstart)
-            page.wait_for_timeout(selenium_headstart * 1000)
-            element: Locator
-            try:
+    def get_screenshot(self, url: str, element_name: str, user: User) -> bytes | None:
+        with self.browser_session() as browser:
+            return self.take_screenshot(browser, url, element_name, user)
+
+    def get_element_screenshots(
+        self,
+        url: str,
+        element_name: str,
+        selectors: dict[Hashable, str],
+        user: User,
+    ) -> Iterator[tuple[Hashable, bytes | None]]:
+        with self.browser_session() as browser:
+            with self.open_page(browser, url, user) as page:
                 try:
-                    # page didn't load
-                    logger.debug(
-                        "Wait for the presence of %s at url: %s", element_name, url
-                    )
-                    element = page.locator(f".{element_name}")
-                    element.wait_for()
+                    ready = self.wait_for_render_ready(page, url)
+                    page.locator(f".{element_name}").wait_for()
+                    if not ready:
+                        self.wait_for_charts(page, url)
                 except PlaywrightTimeout:
-                    logger.exception("Timed out requesting url %s", url)
-                    raise
+                    logger.exception("Timed out loading url %s", url)
+                    return
+
+                for key, selector in selectors.items():
+                    img: bytes | None = None
+                    try:
+                        element = page.locator(selector).first
+                        if element.count():
+                            # charts outside the viewport may only load once visible
+                            element.scroll_into_view_if_needed()
+                            for loading_element in element.locator(".loading").all():
+                                loading_element.wait_for(state="detached")
+                            img = element.screenshot()
+                    except PlaywrightError:
+                        logger.exception(
+                            "Failed to capture %s at url %s", selector, url
+                        )
+                    yield key, img
+
+    def wait_for_render_ready(self, page: Page, url: str) -> bool:
+        """
+        Wait for the page to signal that its charts are rendered, see
+        ``RENDER_STATE_ATTRIBUTE``.
+
+        :returns: False, after the regular headstart, if the page does not emit the
+            signal
+        """
+        start = time.monotonic()
+        headstart = current_app.config["SCREENSHOT_SELENIUM_HEADSTART"]
+        if current_app.config["SCREENSHOT_RENDER_READY_ENABLED"]:
+            try:
+                if headstart:
+                    page.wait_for_function(
+                        RENDER_STATE_PRESENT_JS, timeout=headstart * 1000
+                    )
+                supported = page.evaluate(RENDER_STATE_PRESENT_JS)
+            except PlaywrightTimeout:
+                supported = False
 
+            if supported:
+                logger.debug("Wait for the render ready signal at url: %s", url)
                 try:
-                    # chart containers didn't render
-                    logger.debug("Wait for chart containers to draw at url: %s", url)
-                    slice_container_locator = page.locator(".chart-container")
-                    for slice_container_elem in slice_container_locator.all():
-                        slice_container_elem.wait_for()
+                    page.wait_for_function(
+                        RENDER_STATE_READY_JS,
+                        timeout=self._screenshot_load_wait * 1000,
+                    )
                 except PlaywrightTimeout:
                     logger.exception(
-                        "Timed out waiting for chart containers to draw at url %s",
-                        url,
+                        "Timed out waiting for charts to render at url %s", url
                     )
                     raise
+                self.record_render_timings(
+                    url,
+                    time.monotonic() - start,
+                    page.evaluate(CHART_RENDER_TIMES_JS),
+                )
+                return True
+
+        remaining = max(headstart - (time.monotonic() - start), 0)
+        logger.debug("Sleeping for %i seconds", remaining)
+        page.wait_for_timeout(remaining * 1000)
+        return False
+
+    def wait_for_charts(self, page: Page, url: str) -> None:
+        """
+        Wait for charts using fixed delays, for pages without the render ready
+        signal.
+        """
+        try:
+            # chart containers didn't render
+            logger.debug("Wait for chart containers to draw at url: %s", url)
+            slice_container_locator = page.locator(".chart-container")
+            for slice_container_elem in slice_container_locator.all():
+                slice_container_elem.wait_for()
+        except PlaywrightTimeout:
+            logger.exception(
+                "Timed out waiting for chart containers to draw at url %s",
+                url,
+            )
+            raise
+        try:
+            # charts took too long to load
+            logger.debug(
+                "Wait for loading element of charts to be gone at url: %s", url
+            )
+            for loading_element in page.locator(".loading").all():
+                loading_element.wait_for(state="detached")
+        except PlaywrightTimeout:
+            logger.exception("Timed out waiting for charts to load at url %s", url)
+            raise
+
+        selenium_animation_wait = current_app.config[
+            "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
+        ]
+        logger.debug("Wait %i seconds for chart animation", selenium_animation_wait)
+        page.wait_for_timeout(selenium_animation_wait * 1000)
+
+    def take_screenshot(  # pylint: disable=too-many-locals, too-many-statements  # noqa: C901
+        self, browser: Browser, url: str, element_name: str, user: User
+    ) -> bytes | None:
+        with self.open_page(browser, url, user) as page:
+            img: bytes | None = None
+            element: Locator
+            try:
+                ready = self.wait_for_render_ready(page, url)
                 try:
-                    # charts took too long to load
+                    # page didn't load
                     logger.debug(
-                        "Wait for loading element of charts to be gone at url: %s", url
+                        "Wait for the presence of %s at url: %s", element_name, url
                     )
-                    for loading_element in page.locator(".loading").all():
-                        loading_element.wait_for(state="detached")
+                    element = page.locator(f".{element_name}")
+                    element.wait_for()
                 except PlaywrightTimeout:
-                    logger.exception(
-                        "Timed out waiting for charts to load at url %s", url
-                    )
+                    logger.exception("Timed out requesting url %s", url)
                     raise
 
-                selenium_animation_wait = current_app.config[
-                    "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
-                ]
-                logger.debug(
-                    "Wait %i seconds for chart animation", selenium_animation_wait
-                )
-                page.wait_for_timeout(selenium_animation_wait * 1000)
+                if not ready:
+                    self.wait_for_charts(page, url)
                 logger.debug(
                     "Taking a PNG screenshot of url %s as user %s",
                     url,
@@ -307,12 +485,41 @@ class WebDriverSelenium(WebDriverProxy):
         logger.debug("Init selenium driver")
         return driver_class(**kwargs)
 
-    def auth(self, user: User) -> WebDriver:
-        driver = self.create()
+    def auth(self, user: User, driver: WebDriver | None = None) -> WebDriver:
+        driver = driver or self.create()
         return machine_auth_provider_factory.instance.authenticate_webdriver(
             driver, user
         )
 
+    @staticmethod
+    def is_alive(driver: WebDriver) -> bool:
+        # raises if the browser or its driver process is gone
+        return driver.current_url is not None
+
+    @staticmethod
+    def reset(driver: WebDriver) -> None:
+        """
+        Clear the session of a pooled driver before it is used for another user.
+
+        Chrome drivers also have the HTTP cache and all the storage of the page
+        origin (IndexedDB, service workers, cache storage...) cleared through the
+        DevTools protocol. Firefox drivers have no such protocol, so they are only
+        reused for the same user, see ``driver_session``.
+        """
+        origin = driver.execute_script(
+            "window.localStorage.clear(); window.sessionStorage.clear();"
+            "return window.location.origin;"
+        )
+        driver.delete_all_cookies()
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            if origin and origin != "null":
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": "all"},
+                )
+        driver.get("about:blank")
+
     @staticmethod
     def destroy(driver: WebDriver, tries: int = 2) -> None:
         """Destroy a driver"""
@@ -383,71 +590,190 @@ class WebDriverSelenium(WebDriverProxy):
 
         return error_messages
 
-    def get_screenshot(self, url: str, element_name: str, user: User) -> bytes | None:  # noqa: C901
-        driver = self.auth(user)
-        driver.set_window_size(*self._window)
-        driver.get(url)
-        img: bytes | None = None
-        selenium_headstart = current_app.config["SCREENSHOT_SELENIUM_HEADSTART"]
-        logger.debug("Sleeping for %i seconds", selenium_headstart)
-        sleep(selenium_headstart)
+    @contextmanager
+    def driver_session(self, user: User) -> Iterator[WebDriver]:
+        """
+        Provide a driver authenticated as ``user``, from the pool with
+        ``SCREENSHOT_BROWSER_POOL_ENABLED``
+        """
+        retries = current_app.config["SCREENSHOT_SELENIUM_RETRIES"]
+        if not current_app.config["SCREENSHOT_BROWSER_POOL_ENABLED"]:
+            driver = self.auth(user)
+            try:
+                yield driver
+            finally:
+                self.destroy(driver, retries)
+            return
+
+        # only Chrome drivers are fully cleared between users, see `reset`
+        key: Hashable = self._driver_type
+        if self._driver_type != "chrome":
+            key = (self._driver_type, user.id)
+        with selenium_pool.checkout(
+            key,
+            self.create,
+            lambda driver: self.destroy(driver, retries),
+            self.is_alive,
+            reset=self.reset,
+        ) as driver:
+            yield self.auth(user, driver)
 
-        try:
+    def get_screenshot(self, url: str, element_name: str, user: User) -> bytes | None:
+        with self.driver_session(user) as driver:
+            return self.take_screenshot(driver, url, element_name, user)
+
+    def get_element_screenshots(
+        self,
+        url: str,
+        element_name: str,
+        selectors: dict[Hashable, str],
+        user: User,
+    ) -> Iterator[tuple[Hashable, bytes | None]]:
+        with self.driver_session(user) as driver:
+            driver.set_window_size(*self._window)
+            driver.get(url)
             try:
-                # page didn't load
-                logger.debug(
-                    "Wait for the presence of %s at url: %s", element_name, url
-                )
-                element = WebDriverWait(driver, self._screenshot_locate_wait).until(
+                ready = self.wait_for_render_ready(driver, url)
+                WebDriverWait(driver, self._screenshot_locate_wait).until(
                     EC.presence_of_element_located((By.CLASS_NAME, element_name))
                 )
+                if not ready:
+                    self.wait_for_charts(driver, url)
             except TimeoutException:
-                logger.exception("Selenium timed out requesting url %s", url)
-                raise
+                logger.exception("Selenium timed out loading url %s", url)
+                return
+
+            for key, selector in selectors.items():
+                img: bytes | None = None
+                try:
+                    if elements := driver.find_elements(By.CSS_SELECTOR, selector):
+                        element = elements[0]
+                        # charts outside the viewport may only load once visible
+                        driver.execute_script(
+                            "arguments[0].scrollIntoView(true);", element
+                        )
+                        WebDriverWait(driver, self._screenshot_load_wait).until_not(
+                            lambda _: element.find_elements(By.CLASS_NAME, "loading")
+                        )
+                        img = element.screenshot_as_png
+                except WebDriverException:
+                    logger.exception("Failed to capture %s at url %s", selector, url)
+                yield key, img
 
+    def wait_for_render_ready(self, driver: WebDriver, url: str) -> bool:
+        """
+        Wait for the page to signal that its charts are rendered, see
+        ``RENDER_STATE_ATTRIBUTE``.
+
+        :returns: False, after the regular headstart, if the page does not emit the
+            signal
+        """
+        start = time.monotonic()
+        headstart = current_app.config["SCREENSHOT_SELENIUM_HEADSTART"]
+        if current_app.config["SCREENSHOT_RENDER_READY_ENABLED"]:
             try:
-                # chart containers didn't render
-                logger.debug("Wait for chart containers to draw at url: %s", url)
-                WebDriverWait(driver, self._screenshot_locate_wait).until(
-                    EC.visibility_of_all_elements_located(
-                        (By.CLASS_NAME, "chart-container")
-                    )
+                supported = WebDriverWait(driver, headstart).until(
+                    lambda d: d.execute_script(f"return {RENDER_STATE_PRESENT_JS}")
                 )
             except TimeoutException:
-                logger.info("Timeout Exception caught")
-                # Fallback to allow a screenshot of an empty dashboard
+                supported = False
+
+            if supported:
+                logger.debug("Wait for the render ready signal at url: %s", url)
                 try:
-                    WebDriverWait(driver, 0).until(
-                        EC.visibility_of_all_elements_located(
-                            (By.CLASS_NAME, "grid-container")
-                        )
+                    WebDriverWait(driver, self._screenshot_load_wait).until(
+                        lambda d: d.execute_script(f"return {RENDER_STATE_READY_JS}")
                     )
-                except:
+                except TimeoutException:
                     logger.exception(
-                        "Selenium timed out waiting for dashboard to draw at url %s",
+                        "Selenium timed out waiting for charts to render at url %s",
                         url,
                     )
                     raise
+                self.record_render_timings(
+                    url,
+                    time.monotonic() - start,
+                    driver.execute_script(f"return {CHART_RENDER_TIMES_JS}"),
+                )
+                return True
 
+        remaining = max(headstart - (time.monotonic() - start), 0)
+        logger.debug("Sleeping for %i seconds", remaining)
+        sleep(remaining)
+        return False
+
+    def wait_for_charts(self, driver: WebDriver, url: str) -> None:
+        """
+        Wait for charts using fixed delays, for pages without the render ready
+        signal.
+        """
+        try:
+            # chart containers didn't render
+            logger.debug("Wait for chart containers to draw at url: %s", url)
+            WebDriverWait(driver, self._screenshot_locate_wait).until(
+                EC.visibility_of_all_elements_located(
+                    (By.CLASS_NAME, "chart-container")
+                )
+            )
+        except TimeoutException:
+            logger.info("Timeout Exception caught")
+            # Fallback to allow a screenshot of an empty dashboard
+            try:
+                WebDriverWait(driver, 0).until(
+                    EC.visibility_of_all_elements_located(
+                        (By.CLASS_NAME, "grid-container")
+                    )
+                )
+            except:
+                logger.exception(
+                    "Selenium timed out waiting for dashboard to draw at url %s",
+                    url,
+                )
+                raise
+
+        try:
+            # charts took too long to load
+            logger.debug(
+                "Wait for loading element of charts to be gone at url: %s", url
+            )
+            WebDriverWait(driver, self._screenshot_load_wait).until_not(
+                EC.presence_of_all_elements_located((By.CLASS_NAME, "loading"))
+            )
+        except TimeoutException:
+            logger.exception(
+                "Selenium timed out waiting for charts to load at url %s", url
+            )
+            raise
+
+        selenium_animation_wait = current_app.config[
+            "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
+        ]
+        logger.debug("Wait %i seconds for chart animation", selenium_animation_wait)
+        sleep(selenium_animation_wait)
+
+    def take_screenshot(  # noqa: C901
+        self, driver: WebDriver, url: str, element_name: str, user: User
+    ) -> bytes | None:
+        driver.set_window_size(*self._window)
+        driver.get(url)
+        img: bytes | None = None
+        ready = self.wait_for_render_ready(driver, url)
+
+        try:
             try:
-                # charts took too long to load
+                # page didn't load
                 logger.debug(
-                    "Wait for loading element of charts to be gone at url: %s", url
+                    "Wait for the presence of %s at url: %s", element_name, url
                 )
-                WebDriverWait(driver, self._screenshot_load_wait).until_not(
-                    EC.presence_of_all_elements_located((By.CLASS_NAME, "loading"))
+                element = WebDriverWait(driver, self._screenshot_locate_wait).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, element_name))
                 )
             except TimeoutException:
-                logger.exception(
-                    "Selenium timed out waiting for charts to load at url %s", url
-                )
+                logger.exception("Selenium timed out requesting url %s", url)
                 raise
 
-            selenium_animation_wait = current_app.config[
-                "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
-            ]
-            logger.debug("Wait %i seconds for chart animation", selenium_animation_wait)
-            sleep(selenium_animation_wait)
+            if not ready:
+                self.wait_for_charts(driver, url)
             logger.debug(
                 "Taking a PNG screenshot of url %s as user %s",
                 url,
@@ -482,6 +808,4 @@ class WebDriverSelenium(WebDriverProxy):
                 "Encountered an unexpected error when requesting url %s", url
             )
             raise
-        finally:
-            self.destroy(driver, current_app.config["SCREENSHOT_SELENIUM_RETRIES"])
         return img